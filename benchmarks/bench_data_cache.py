@@ -0,0 +1,49 @@
+#Benchmark: loading cleaned company data from CSV versus the columnar data cache
+#Run from the repository root: python benchmarks/bench_data_cache.py [rows ...]
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import data_cache
+import schema
+import utils
+from benchmark_data import synthetic_companies
+
+warnings.filterwarnings("ignore")
+
+REPEATS = 3
+
+def best_of(function) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def csv_path(path: str):
+    schema.validate_file(path)
+    return utils.clean_data(pd.read_csv(path, dtype=schema.read_dtypes()))
+
+def main(row_counts):
+    with tempfile.TemporaryDirectory() as directory:
+        data_cache.CACHE_DIR = os.path.join(directory, 'cache')
+        print(f"{'rows':>10} {'csv + clean (s)':>16} {'cache write (s)':>16} {'cache load (s)':>15} {'speedup':>8}")
+        for rows in row_counts:
+            path = synthetic_companies(rows, directory)
+            key = data_cache.cache_key(utils.file_fingerprint(path))
+            cleaned = csv_path(path)
+
+            cold = best_of(lambda: csv_path(path))
+            write = best_of(lambda: data_cache.save(path, key, cleaned, 'Series A'))
+            warm = best_of(lambda: data_cache.load(path, key))
+            print(f"{len(cleaned):>10} {cold:>16.3f} {write:>16.3f} {warm:>15.3f} {cold / warm:>7.1f}x")
+
+if __name__ == '__main__':
+    main([int(rows) for rows in sys.argv[1:]] or [500, 5_000, 50_000])
@@ -0,0 +1,32 @@
+#Benchmark: memory held by the company data in the regular and in the compact Market layout
+#Run from the repository root: python benchmarks/bench_memory.py [rows ...]
+
+import os
+import sys
+import tempfile
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import market
+from benchmark_data import synthetic_companies
+
+warnings.filterwarnings("ignore")
+
+BUNDLED_FILES = ['InputData/Seed_Europe_min2mio_companies-25-11-2024.csv', 'InputData/seriesA_Europe_companies-25-11-2024.csv']
+
+def measure(path: str):
+    regular = market.Market(path, use_data_cache=False)
+    compact_market = market.Market(path, use_data_cache=False, compact=True)
+    return len(regular.cleaned_df), regular.memory_usage(), compact_market.memory_usage()
+
+def main(row_counts):
+    print(f"{'file':<45} {'rows':>8} {'regular (MB)':>13} {'compact (MB)':>13} {'ratio':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        paths = BUNDLED_FILES + [synthetic_companies(rows, directory) for rows in row_counts]
+        for path in paths:
+            rows, regular, compact_bytes = measure(path)
+            print(f"{os.path.basename(path)[:45]:<45} {rows:>8} {regular / 1e6:>13.2f} {compact_bytes / 1e6:>13.2f} {regular / compact_bytes:>5.1f}x")
+
+if __name__ == '__main__':
+    main([int(rows) for rows in sys.argv[1:]] or [5_000, 50_000])
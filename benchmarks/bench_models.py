@@ -0,0 +1,43 @@
+#Benchmark: training time, prediction throughput and cross-validation score of every model backend
+#Run from the repository root: python benchmarks/bench_models.py [rows ...]
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import market
+import model_backends
+from benchmark_data import synthetic_companies
+
+warnings.filterwarnings("ignore")
+
+PREDICT_ROWS = 500_000
+
+def main(row_counts):
+    print(f"Cores: {os.cpu_count()}, prediction throughput measured on {PREDICT_ROWS:,} rows")
+    print(f"{'rows':>8} {'backend':<24} {'train + cv (s)':>15} {'predict (rows/s)':>17} {'mean cv score':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in row_counts:
+            path = synthetic_companies(rows, directory)
+            for backend in model_backends.BACKENDS:
+                backend_market = market.Market(path, use_model_cache=False, use_data_cache=False, model_backend=backend)
+                companies = backend_market.cleaned_df
+
+                start = time.perf_counter()
+                results = backend_market.predictive_model
+                training = time.perf_counter() - start
+
+                repeated = pd.concat([companies] * (PREDICT_ROWS // len(companies) + 1), ignore_index=True).iloc[:PREDICT_ROWS]
+                start = time.perf_counter()
+                backend_market.predict(repeated)
+                throughput = len(repeated) / (time.perf_counter() - start)
+
+                print(f"{len(companies):>8} {backend:<24} {training:>15.2f} {throughput:>17,.0f} {results['mean_cv_score']:>14.3f}")
+
+if __name__ == '__main__':
+    main([int(rows) for rows in sys.argv[1:]] or [500, 5_000])
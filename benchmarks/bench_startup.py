@@ -0,0 +1,52 @@
+#Benchmark: cold-start latency of the CLI, measured with python -X importtime in fresh interpreters
+#Run from the repository root: python benchmarks/bench_startup.py [repeats]
+#Exits with status 1 when a heavy library is imported before the menu is shown
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#What each step of a session imports, in a fresh interpreter each
+STEPS = {
+    'menu (import main)': 'import main',
+    'load data (import market)': 'import market',
+    'train model (import sklearn)': 'import market, sklearn.ensemble, sklearn.model_selection, sklearn.preprocessing',
+    'visualize (import visualizer)': 'import visualizer',
+}
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'sklearn', 'matplotlib', 'seaborn', 'rapidfuzz', 'joblib')
+REPEATS = 5
+
+def import_times(statement: str) -> dict:
+    #Cumulative import time in microseconds of every module imported by statement
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+def top_level_total(times: dict, statement: str) -> int:
+    modules = [module.strip().split('.')[0] for module in statement.replace('import', '').split(',')]
+    return sum(times.get(module, 0) for module in dict.fromkeys(modules))
+
+def main(repeats: int):
+    print(f"{'step':<32} {'best (ms)':>10} {'median (ms)':>12}  heavy libraries loaded")
+    menu_heavy = []
+    for step, statement in STEPS.items():
+        runs = [import_times(statement) for _ in range(repeats)]
+        totals = sorted(top_level_total(times, statement) / 1000 for times in runs)
+        heavy = [module for module in HEAVY_MODULES if module in runs[0]]
+        print(f"{step:<32} {totals[0]:>10.1f} {totals[len(totals) // 2]:>12.1f}  {', '.join(heavy) or '-'}")
+        if statement == 'import main':
+            menu_heavy = heavy
+
+    if menu_heavy:
+        print(f"Heavy libraries imported before the menu is shown: {', '.join(menu_heavy)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS)
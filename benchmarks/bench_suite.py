@@ -0,0 +1,167 @@
+#Benchmark suite: times loading, statistics, training, scoring and exports on synthetic data at several scales
+#Results are written as JSON and compared with a stored baseline, a step that got slower than the tolerance is a regression
+#Run from the repository root: python benchmarks/bench_suite.py [--scales 1000 10000] [--save-baseline]
+#The exit code is 1 when a regression was found, so the suite can gate a change
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import exports
+import investor
+import market
+import model_backends
+import profiling
+import synthetic
+
+warnings.filterwarnings("ignore")
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SCALES = [1_000, 10_000]
+TOLERANCE = 0.5 #A step is a regression when it takes more than 50% longer than in the baseline
+MIN_SECONDS = 0.1 #and at least this much longer, so noise on very short steps is not reported
+TOP_COMPANIES = 100
+WEIGHTS = (0.4, 0.3, 0.3)
+
+def environment() -> dict:
+    #Timings are only comparable on similar machines, the baseline records where it was measured
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+def run_scale(rows: int, directory: str, arguments) -> dict:
+    #Every step is a top level stage of its own profiler, the stages of Market and the exports are nested below them
+    profiler = profiling.Profiler(track_memory=arguments.memory)
+    skip = set(arguments.skip)
+    if 'training' in skip:
+        skip.update(['scoring', 'export']) #Both predict with the trained model, they would time the training instead
+    scale_directory = os.path.join(directory, str(rows))
+
+    with profiler.stage('generate', rows):
+        paths = synthetic.write_dataset(scale_directory, rows, arguments.funding_round, arguments.seed)
+    with profiler.stage('load_investors') as record:
+        registry = investor.InvestorRegistry.from_csv(paths['eu_investors'], paths['us_investors'])
+        record.rows = len(registry.names)
+    with profiler.stage('load_companies', rows):
+        scale_market = market.Market(paths['companies'], use_model_cache=False, use_data_cache=False, compact=arguments.compact,
+                                     model_backend=arguments.model_backend, profiler=profiler)
+        scale_market.investors = registry
+        scale_market.cleaned_df
+    with profiler.stage('statistics_overall', rows):
+        scale_market.overall_statistics
+    with profiler.stage('statistics_industry', rows):
+        scale_market.industry_group_statistics
+    if 'training' not in skip:
+        with profiler.stage('training', rows):
+            scale_market.predictive_model
+    if 'scoring' not in skip:
+        with profiler.stage('scoring', rows):
+            scale_market.best_companies(TOP_COMPANIES, *WEIGHTS)
+    if 'export' not in skip:
+        with profiler.stage('export_all', rows):
+            exports.export_all(scale_market, TOP_COMPANIES, *WEIGHTS, file_format='csv', directory=os.path.join(scale_directory, 'Exports'))
+    profiler.stop()
+
+    steps = {record['stage']: record for record in profiler.report() if record.get('parent') is None}
+    return {
+        'rows': rows,
+        'steps': {name: {key: value for key, value in step.items() if key not in ('stage', 'parent')} for name, step in steps.items()},
+        'stages': profiler.summary()
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE, min_seconds: float = MIN_SECONDS) -> list:
+    #Steps measured in both runs that got slower than the tolerance allows, as (scale, step, baseline, current, ratio)
+    regressions = []
+    for scale, scale_results in results['scales'].items():
+        baseline_steps = baseline.get('scales', {}).get(scale, {}).get('steps', {})
+        for step, timing in scale_results['steps'].items():
+            if step not in baseline_steps:
+                continue
+            before, after = baseline_steps[step]['wall_seconds'], timing['wall_seconds']
+            if after > before * (1 + tolerance) and after - before > min_seconds:
+                regressions.append((scale, step, before, after, after / before if before else float('inf')))
+    return regressions
+
+def format_results(results: dict, baseline: dict = None) -> str:
+    lines = [f"{'rows':>9} {'step':<22} {'wall (s)':>9} {'cpu (s)':>9} {'peak (MB)':>10} {'baseline (s)':>13} {'ratio':>7}"]
+    for scale, scale_results in results['scales'].items():
+        baseline_steps = (baseline or {}).get('scales', {}).get(scale, {}).get('steps', {})
+        for step, timing in scale_results['steps'].items():
+            peak = f"{timing['peak_memory_bytes'] / 1e6:.1f}" if 'peak_memory_bytes' in timing else '-'
+            before = baseline_steps.get(step, {}).get('wall_seconds')
+            ratio = f"{timing['wall_seconds'] / before:.2f}" if before else '-'
+            before = f"{before:.3f}" if before is not None else '-'
+            lines.append(f"{scale:>9} {step:<22} {timing['wall_seconds']:>9.3f} {timing['cpu_seconds']:>9.3f} {peak:>10} {before:>13} {ratio:>7}")
+    return '\n'.join(lines)
+
+def parse_arguments(arguments=None):
+    parser = argparse.ArgumentParser(description='Time every stage of the application on synthetic data and flag regressions')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help='Numbers of companies (default: %(default)s)')
+    parser.add_argument('--round', dest='funding_round', default='Series A', choices=list(synthetic.ROUND_PROFILES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--model-backend', default=model_backends.DEFAULT_BACKEND, choices=list(model_backends.BACKENDS))
+    parser.add_argument('--compact', action='store_true', help='Load the companies in the memory-compact layout')
+    parser.add_argument('--memory', action='store_true', help='Also record peak memory per step (slows every step down)')
+    parser.add_argument('--skip', nargs='+', default=[], choices=['training', 'scoring', 'export'], help='Steps that are not run, skipping training also skips scoring and export')
+    parser.add_argument('--output', default='bench_results.json', help='Results file (default: %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline the results are compared with (default: benchmarks/baseline.json)')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='Allowed slowdown before a step is a regression (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline instead of comparing')
+    return parser.parse_args(arguments)
+
+def main(arguments) -> int:
+    results = {'environment': environment(), 'settings': {'funding_round': arguments.funding_round, 'seed': arguments.seed,
+               'model_backend': arguments.model_backend, 'compact': arguments.compact, 'memory': arguments.memory}, 'scales': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in arguments.scales:
+            print(f"Running {rows:,} companies")
+            results['scales'][str(rows)] = run_scale(rows, directory, arguments)
+
+    with open(arguments.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {arguments.output}")
+
+    if arguments.save_baseline:
+        with open(arguments.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(format_results(results))
+        print(f"Baseline saved to {arguments.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(arguments.baseline):
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+    print(format_results(results, baseline))
+    if baseline is None:
+        print(f"No baseline at {arguments.baseline}, run with --save-baseline to store one")
+        return 0
+
+    if baseline['settings'] != results['settings']:
+        print(f"Note: the baseline was measured with other settings {baseline['settings']}")
+    if baseline['environment']['cpu_count'] != results['environment']['cpu_count']:
+        print(f"Note: the baseline was measured on {baseline['environment']['cpu_count']} cores, this machine has {results['environment']['cpu_count']}")
+
+    regressions = compare(results, baseline, arguments.tolerance)
+    for scale, step, before, after, ratio in regressions:
+        print(f"REGRESSION {step} at {int(scale):,} rows: {before:.3f}s -> {after:.3f}s ({ratio:.2f}x)")
+    if not regressions:
+        print(f"No regressions against the baseline (tolerance {arguments.tolerance:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main(parse_arguments()))
@@ -0,0 +1,8 @@
+#Shared helper of the benchmarks: synthetic company exports of any size, written by synthetic.py
+
+import os
+import synthetic
+
+def synthetic_companies(rows: int, directory: str, funding_round: str = 'Series A', seed: int = 42) -> str:
+    #Path of a synthetic export with rows distinct companies, in the layout of the bundled files
+    return synthetic.write_dataset(os.path.join(directory, f'rows_{rows}'), rows, funding_round, seed)['companies']
@@ -0,0 +1,132 @@
+#Regression check: the stateful fast paths must give the same results as loading the data from scratch
+#- apply_delta against a fresh Market on the merged file (statistics, investor score sums, aliases and top-n)
+#- data cache round-trips (regular and compact layout) against parsing and cleaning the CSV
+#Run from the repository root: python benchmarks/check_consistency.py [rows]
+#The exit code is 1 when any check fails, so the script can gate a change
+
+import os
+import sys
+import tempfile
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import compact
+import data_cache
+import investor
+import market
+import model_cache
+import resolution
+import synthetic
+
+warnings.filterwarnings("ignore")
+
+DEFAULT_ROWS = 2_000
+DELTA_UPDATES = 100
+DELTA_INSERTS = 100
+SEED = 7
+#The delta market keeps its model until enough rows changed, so the rankings leave out the model based funding difference
+RANKING_WEIGHTS = (1.0, 0.0, 0.3)
+TOP_COMPANIES = 50
+MODEL_BACKEND = 'linear' #The fastest backend, the checks do not depend on the model
+
+failures = []
+
+def check(name: str, passed: bool, details: str = ''):
+    print(f"{'ok' if passed else 'FAILED':<7} {name}" + (f" ({details})" if details and not passed else ''))
+    if not passed:
+        failures.append(name)
+
+def frames_equal(left: pd.DataFrame, right: pd.DataFrame) -> tuple:
+    try:
+        pd.testing.assert_frame_equal(left.reset_index(drop=True), right.reset_index(drop=True), check_dtype=False, check_categorical=False)
+        return True, ''
+    except AssertionError as error:
+        return False, str(error).splitlines()[0]
+
+def load_market(path: str, registry, **options) -> market.Market:
+    checked_market = market.Market(path, use_model_cache=False, model_backend=MODEL_BACKEND, **options)
+    checked_market.investors = registry
+    return checked_market
+
+def write_delta_files(directory: str, rows: int, investors: pd.DataFrame) -> dict:
+    #Base file, a delta that updates DELTA_UPDATES companies (new amounts, investors and industries) and inserts DELTA_INSERTS,
+    #and the merged file a full load of the updated market would read
+    base = synthetic.generate_companies(rows, seed=SEED, investors=investors)
+    delta = synthetic.generate_companies(DELTA_UPDATES + DELTA_INSERTS, seed=SEED, investors=investors, first_row=rows)
+    updated_positions = np.random.default_rng(SEED).choice(rows, DELTA_UPDATES, replace=False)
+    delta.loc[:DELTA_UPDATES - 1, 'Organization Name URL'] = base['Organization Name URL'].to_numpy()[updated_positions]
+
+    merged = base.copy()
+    merged.iloc[updated_positions] = delta.iloc[:DELTA_UPDATES].to_numpy()
+    merged = pd.concat([merged, delta.iloc[DELTA_UPDATES:]], ignore_index=True)
+
+    paths = {}
+    for name, df in [('base', base), ('delta', delta), ('merged', merged)]:
+        paths[name] = os.path.join(directory, f'{name}.csv')
+        df.to_csv(paths[name], index=False)
+    return paths
+
+def check_delta(directory: str, rows: int, investors: pd.DataFrame, registry):
+    paths = write_delta_files(directory, rows, investors)
+    delta_market = load_market(paths['base'], registry, use_data_cache=False)
+    delta_market.best_companies(TOP_COMPANIES, *RANKING_WEIGHTS) #Builds the state the delta is applied to
+    result = delta_market.apply_delta(paths['delta'])
+    fresh_market = load_market(paths['merged'], registry, use_data_cache=False)
+
+    check('delta upserts', result['updated'] == DELTA_UPDATES and result['inserted'] == DELTA_INSERTS, str(result))
+    check('delta company order', delta_market.cleaned_df['Organization Name URL'].tolist() == fresh_market.cleaned_df['Organization Name URL'].tolist())
+    check('delta overall statistics', delta_market.overall_statistics == fresh_market.overall_statistics,
+          f"{delta_market.overall_statistics} != {fresh_market.overall_statistics}")
+    check('delta industry statistics', delta_market.industry_group_statistics == fresh_market.industry_group_statistics)
+    check('delta investor score sums', np.allclose(delta_market.investor_score_sums, fresh_market.investor_score_sums, equal_nan=True))
+
+    delta_aliases = delta_market.investor_aliases.table.set_index('Alias')['Investor Position']
+    fresh_aliases = fresh_market.investor_aliases.table.set_index('Alias')['Investor Position']
+    check('delta investor aliases', delta_aliases.reindex(fresh_aliases.index).equals(fresh_aliases.astype(delta_aliases.dtype)))
+
+    delta_top = delta_market.best_companies(TOP_COMPANIES, *RANKING_WEIGHTS)
+    fresh_top = fresh_market.best_companies(TOP_COMPANIES, *RANKING_WEIGHTS)
+    check('delta top companies', delta_top['Organization Name URL'].tolist() == fresh_top['Organization Name URL'].tolist())
+
+    #Predictions of the delta rows come from the market's model, the same as predicting them afterwards
+    delta_rows = delta_market.cleaned_df.iloc[-DELTA_INSERTS:]
+    check('delta predictions', np.allclose(delta_rows['Expected Next Funding'], delta_market.predict(delta_rows)))
+
+def check_data_cache(path: str, registry):
+    #The first load parses the CSV and writes the cache, the second one is served from the cache
+    #A cache hit is the only way cleaned data exists right after construction, the compact pass reuses the entry of the regular pass
+    for compact_mode in (False, True):
+        layout = f"{os.path.basename(path)}, {'compact' if compact_mode else 'regular'}"
+        parsed = load_market(path, registry, compact=compact_mode)
+        parsed_from_cache = parsed._cleaned_df is not None
+        parsed_rows = parsed.rows(np.arange(len(parsed.cleaned_df)))
+        cached = load_market(path, registry, compact=compact_mode)
+        check(f'data cache hit ({layout})', cached._cleaned_df is not None and cached.funding_round == parsed.funding_round
+              and (compact_mode or not parsed_from_cache))
+        check(f'data cache rows ({layout})', *frames_equal(cached.rows(np.arange(len(cached.cleaned_df))), parsed_rows))
+        check(f'data cache statistics ({layout})', cached.overall_statistics == parsed.overall_statistics
+              and cached.industry_group_statistics == parsed.industry_group_statistics)
+        check(f'data cache top companies ({layout})', *frames_equal(cached.best_companies(TOP_COMPANIES, *RANKING_WEIGHTS),
+                                                                     parsed.best_companies(TOP_COMPANIES, *RANKING_WEIGHTS)))
+
+def main(rows: int) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        #Every cache lives in the temporary directory, so the checks neither use nor touch the caches of the application
+        for module, name in [(data_cache, 'data'), (model_cache, 'models'), (resolution, 'aliases'), (compact, 'text')]:
+            module.CACHE_DIR = os.path.join(directory, 'cache', name)
+        investors = synthetic.generate_investors(seed=SEED)
+        eu_path, us_path = synthetic.write_investors(directory, seed=SEED)
+        registry = investor.InvestorRegistry.from_csv(eu_path, us_path)
+
+        check_delta(directory, rows, investors, registry)
+        check_data_cache(synthetic.write_companies(os.path.join(directory, 'companies.csv'), rows, seed=SEED, investors=investors), registry)
+        check_data_cache('InputData/seriesA_Europe_companies-25-11-2024.csv', investor.get_registry())
+
+    print(f"{len(failures)} check(s) failed" if failures else "All checks passed")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS))
@@ -0,0 +1,179 @@
+#This files purpose is the memory-compact storage mode of the cleaned company data
+#List columns become flat code arrays plus row offsets (CSR), repeated strings become categoricals,
+#numbers are downcast and Full Description moves to a memory-mapped side store that is only read for the rows shown or exported
+
+import os
+import shutil
+import sys
+import numpy as np
+import pandas as pd
+import utils
+
+CACHE_DIR = os.path.join('.cache', 'text')
+MAX_ENTRIES = 20
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+SIDE_STORE_COLUMNS = ['Full Description']
+
+class ListColumn:
+    #A column of string lists as categorical codes of all items plus row offsets, rows without a list are marked invalid
+    def __init__(self, codes: np.ndarray, categories: pd.Index, offsets: np.ndarray, valid: np.ndarray):
+        self.codes = codes
+        self.categories = categories
+        self.offsets = offsets
+        self.valid = valid
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> 'ListColumn':
+        lists = [items if isinstance(items, list) else [] for items in series]
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(items) for items in lists], out=offsets[1:])
+        codes, categories = pd.factorize(np.array([item for items in lists for item in items], dtype=object))
+        valid = np.array([isinstance(items, list) for items in series], dtype=bool)
+        return cls(codes.astype(np.int32), pd.Index(categories), offsets, valid)
+
+    def __len__(self):
+        return len(self.valid)
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self)), self.lengths())
+
+    def values(self) -> np.ndarray:
+        return self.categories.to_numpy()[self.codes]
+
+    def take(self, positions) -> 'ListColumn':
+        positions = np.asarray(positions, dtype=np.int64)
+        lengths = self.lengths()[positions]
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        #Index of every item of the selected rows, in row order
+        items = np.repeat(self.offsets[positions] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return ListColumn(self.codes[items], self.categories, offsets, self.valid[positions])
+
+    def to_lists(self, positions=None) -> np.ndarray:
+        column = self if positions is None else self.take(positions)
+        flat = column.values().tolist()
+        bounds = column.offsets.tolist()
+        rows = np.empty(len(column), dtype=object)
+        rows[:] = [flat[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        rows[~column.valid] = None
+        return rows
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.offsets.nbytes + self.valid.nbytes + int(self.categories.memory_usage(deep=True))
+
+def flatten_lists(column):
+    #(row position, item) for every list item, for a Series of lists and a ListColumn alike
+    if isinstance(column, ListColumn):
+        return column.row_ids(), column.values()
+    exploded = column.reset_index(drop=True).explode().dropna()
+    return exploded.index.to_numpy(dtype=np.int64), exploded.to_numpy(dtype=object)
+
+def list_lengths(column) -> np.ndarray:
+    if isinstance(column, ListColumn):
+        return column.lengths()
+    return np.array([len(items) if isinstance(items, list) else 0 for items in column], dtype=np.int64)
+
+class TextStore:
+    #Memory-mapped utf-8 blob plus byte offsets, strings are decoded only for the rows that are asked for
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.blob = np.load(os.path.join(directory, 'blob.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(directory, 'offsets.npy'), mmap_mode='r')
+        self.valid = np.load(os.path.join(directory, 'valid.npy'), mmap_mode='r')
+
+    @classmethod
+    def write(cls, values, directory: str) -> 'TextStore':
+        #A store that already exists for the same data is reused, it may be memory-mapped by another Market right now
+        if os.path.exists(os.path.join(directory, 'valid.npy')):
+            os.utime(directory) #Mark as recently used for eviction
+            return cls(directory)
+
+        temporary_path = directory + '.tmp'
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+        encoded = [value.encode('utf-8') if isinstance(value, str) else b'' for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        np.save(os.path.join(temporary_path, 'blob.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+        np.save(os.path.join(temporary_path, 'offsets.npy'), offsets)
+        np.save(os.path.join(temporary_path, 'valid.npy'), np.array([isinstance(value, str) for value in values], dtype=bool))
+        os.makedirs(os.path.dirname(directory) or '.', exist_ok=True)
+        try:
+            os.rename(temporary_path, directory)
+        except OSError:
+            shutil.rmtree(temporary_path, ignore_errors=True) #Written by someone else in the meantime
+        return cls(directory)
+
+    def __len__(self):
+        return len(self.valid)
+
+    def get(self, positions) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.int64)
+        values = np.empty(len(positions), dtype=object)
+        values[:] = [self.blob[self.offsets[position]:self.offsets[position + 1]].tobytes().decode('utf-8') for position in positions]
+        values[~self.valid[positions]] = np.nan
+        return values
+
+def downcast_numbers(df: pd.DataFrame) -> pd.DataFrame:
+    #Integers shrink to the smallest type holding every value, floats only when every value is a whole number
+    #Float columns with missing values stay float64 so the statistics and model features are computed exactly as before
+    for column in df.columns:
+        values = df[column]
+        if values.dtype.kind == 'f' and not values.isna().any() and np.array_equal(values, np.round(values)):
+            values = values.astype(np.int64)
+        if values.dtype.kind in 'iu':
+            df[column] = pd.to_numeric(values, downcast='integer')
+    return df
+
+def categorize_strings(df: pd.DataFrame) -> pd.DataFrame:
+    for column in df.columns:
+        if df[column].dtype == object and df[column].nunique() <= CATEGORICAL_MAX_UNIQUE_RATIO * len(df):
+            df[column] = df[column].astype('category')
+    return df
+
+class CompactData:
+    #The compact frame plus the columns kept outside of it
+    def __init__(self, frame: pd.DataFrame, list_columns: dict, side_store: dict):
+        self.frame = frame
+        self.list_columns = list_columns
+        self.side_store = side_store
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, side_store_directory: str) -> 'CompactData':
+        #side_store_directory must be unique to the data, e.g. keyed by the file hash
+        list_columns = {column: ListColumn.from_series(df[column]) for column in utils.LIST_COLUMNS if column in df.columns}
+        side_store = {
+            column: TextStore.write(df[column].to_numpy(), os.path.join(side_store_directory, str(position)))
+            for position, column in enumerate(SIDE_STORE_COLUMNS) if column in df.columns
+        }
+        frame = df.drop(columns=list(list_columns) + list(side_store))
+        frame = categorize_strings(downcast_numbers(frame.copy()))
+        return cls(frame, list_columns, side_store)
+
+    def rows(self, positions, frame: pd.DataFrame = None) -> pd.DataFrame:
+        #Full rows in the regular layout (lists and descriptions included) for the given positions only
+        frame = self.frame if frame is None else frame
+        positions = np.asarray(positions, dtype=np.int64)
+        rows = frame.iloc[positions].copy()
+        for column, list_column in self.list_columns.items():
+            rows[column] = list_column.to_lists(positions)
+        for column, store in self.side_store.items():
+            rows[column] = store.get(positions)
+        regular_order = [column for column in utils.COLUMNS_TO_KEEP if column in rows.columns]
+        return rows[regular_order + [column for column in rows.columns if column not in regular_order]]
+
+    def memory_usage(self) -> int:
+        #Bytes held in memory, the memory-mapped side store is not counted
+        return int(self.frame.memory_usage(deep=True).sum()) + sum(column.nbytes for column in self.list_columns.values())
+
+def frame_memory_usage(df: pd.DataFrame) -> int:
+    #pandas counts a list cell as the list object only, the strings inside are added here
+    total = int(df.memory_usage(deep=True).sum())
+    for column in utils.LIST_COLUMNS:
+        if column in df.columns:
+            total += sum(sys.getsizeof(item) for items in df[column] if isinstance(items, list) for item in items)
+    return total
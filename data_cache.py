@@ -0,0 +1,134 @@
+#This files purpose is to keep cleaned company data on disk in a columnar binary layout
+#Every column is stored as plain numpy arrays that are memory-mapped on load, so warm reloads skip CSV parsing and string splitting
+
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import schema
+import utils
+
+CACHE_DIR = os.path.join('.cache', 'data')
+CACHE_VERSION = 1
+MAX_ENTRIES = 20
+SEPARATOR = '\x00'
+
+def cache_key(file_hash: str) -> str:
+    settings = json.dumps({
+        'version': CACHE_VERSION,
+        'schema_version': schema.SCHEMA_VERSION,
+        'file_hash': file_hash
+    }, sort_keys=True)
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+def _entry_path(file_path: str, key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{utils.source_id(file_path)}-{key}")
+
+def encode_strings(values) -> dict:
+    #All strings are joined into one NUL separated utf-8 blob, so decoding is a single decode and split
+    valid = np.array([isinstance(value, str) for value in values], dtype=bool)
+    strings = [value if isinstance(value, str) else '' for value in values]
+    if any(SEPARATOR in string for string in strings):
+        raise ValueError('Strings containing NUL characters cannot be stored in the data cache')
+    return {
+        'blob': np.frombuffer(SEPARATOR.join(strings).encode('utf-8'), dtype=np.uint8),
+        'valid': valid
+    }
+
+def decode_strings(blob: np.ndarray, valid: np.ndarray, missing=np.nan) -> np.ndarray:
+    values = np.empty(len(valid), dtype=object)
+    if len(valid):
+        values[:] = blob.tobytes().decode('utf-8').split(SEPARATOR)
+    values[~np.asarray(valid)] = missing
+    return values
+
+def encode_lists(values) -> dict:
+    #Lists are flattened into one string column plus row offsets (CSR layout), rows without a list are marked invalid
+    valid = np.array([isinstance(value, list) for value in values], dtype=bool)
+    lists = [value if isinstance(value, list) else [] for value in values]
+    row_offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(items) for items in lists], out=row_offsets[1:])
+    flat = encode_strings([item for items in lists for item in items])
+    return {
+        'blob': flat['blob'],
+        'valid': flat['valid'],
+        'row_offsets': row_offsets,
+        'row_valid': valid
+    }
+
+def decode_lists(blob: np.ndarray, valid: np.ndarray, row_offsets: np.ndarray, row_valid: np.ndarray) -> np.ndarray:
+    flat = decode_strings(blob, valid).tolist()
+    bounds = row_offsets.tolist()
+    rows = np.empty(len(bounds) - 1, dtype=object)
+    rows[:] = list(map(flat.__getitem__, map(slice, bounds[:-1], bounds[1:])))
+    rows[~np.asarray(row_valid)] = None
+    return rows
+
+def _column_kind(df: pd.DataFrame, column: str) -> str:
+    if column in utils.LIST_COLUMNS:
+        return 'list'
+    if df[column].dtype.kind in 'biufM':
+        return 'array'
+    return 'string'
+
+def save(file_path: str, key: str, df: pd.DataFrame, funding_round: str):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entry_path = _entry_path(file_path, key)
+    utils.evict_stale_entries(CACHE_DIR, file_path, entry_path, MAX_ENTRIES)
+
+    #Build the entry in a temporary directory and move it into place, so readers never see a partial entry
+    temporary_path = entry_path + '.tmp'
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+
+    columns = []
+    for position, column in enumerate(df.columns):
+        kind = _column_kind(df, column)
+        if kind == 'array':
+            arrays = {'values': df[column].to_numpy()}
+        elif kind == 'list':
+            arrays = encode_lists(df[column].to_numpy())
+        else:
+            arrays = encode_strings(df[column].to_numpy())
+
+        files = {}
+        for part, array in arrays.items():
+            files[part] = f"{position}-{part}.npy"
+            np.save(os.path.join(temporary_path, files[part]), array)
+        columns.append({'name': column, 'kind': kind, 'files': files})
+
+    with open(os.path.join(temporary_path, 'meta.json'), 'w') as file:
+        json.dump({'rows': len(df), 'funding_round': funding_round, 'columns': columns}, file)
+
+    shutil.rmtree(entry_path, ignore_errors=True)
+    os.replace(temporary_path, entry_path)
+
+def load(file_path: str, key: str):
+    #Returns (cleaned_df, funding_round), or None when there is no usable entry
+    entry_path = _entry_path(file_path, key)
+    meta_path = os.path.join(entry_path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path) as file:
+            meta = json.load(file)
+
+        data = {}
+        for column in meta['columns']:
+            #Copy-on-write maps: numeric and date columns are paged in lazily and stay writable for later stages
+            arrays = {part: np.load(os.path.join(entry_path, name), mmap_mode='c') for part, name in column['files'].items()}
+            if column['kind'] == 'array':
+                data[column['name']] = arrays['values']
+            elif column['kind'] == 'list':
+                data[column['name']] = decode_lists(**arrays)
+            else:
+                data[column['name']] = decode_strings(**arrays)
+    except (OSError, ValueError, KeyError):
+        #A corrupt or incompatible entry is treated like a miss and overwritten by the next save
+        return None
+
+    os.utime(entry_path) #Mark as recently used for eviction
+    return pd.DataFrame(data, copy=False), meta['funding_round']
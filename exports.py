@@ -0,0 +1,82 @@
+#This files purpose is to write every export of menu option 7 in one pass
+#Everything is computed once from the loaded Market and the shared investor registry, then the files are written concurrently
+#CSV matches the previous exports, JSON Lines is streamed in chunks and Parquet needs the optional pyarrow package
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import profiling
+
+EXPORT_DIRECTORY = 'Exports'
+FORMATS = ('csv', 'jsonl', 'parquet')
+CHUNK_ROWS = 50_000 #Rows serialized at once, bounds the memory of a JSON Lines or CSV write
+TOP_INVESTORS = 20
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet exports need the optional pyarrow package: pip install pyarrow") from None
+
+def check_format(file_format: str):
+    #Called by every export before anything is written, so an unusable format never leaves a partial export behind
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown export format '{file_format}', available: {list(FORMATS)}")
+    if file_format == 'parquet':
+        _require_pyarrow()
+
+def write_frame(df: pd.DataFrame, path_stem: str, file_format: str, index_label: str = None) -> str:
+    #Writes df next to a temporary file and moves it into place, so a failed export never leaves half a file behind
+    check_format(file_format)
+    path = f"{path_stem}.{file_format}"
+    temporary_path = path + '.tmp'
+
+    if file_format == 'csv':
+        #The index is only written when it carries data (e.g. the industry names), like the previous exports
+        df.to_csv(temporary_path, index=index_label is not None, chunksize=CHUNK_ROWS)
+    else:
+        if index_label is not None:
+            df = df.rename_axis(index_label).reset_index()
+        if file_format == 'jsonl':
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                for start in range(0, len(df), CHUNK_ROWS):
+                    file.write(df.iloc[start:start + CHUNK_ROWS].to_json(orient='records', lines=True, date_format='iso').rstrip('\n') + '\n')
+        else:
+            df.to_parquet(temporary_path, index=False)
+    os.replace(temporary_path, path)
+    return path
+
+def write_overall_statistics(statistics: dict, path: str) -> str:
+    with open(path, 'w') as file:
+        for key, value in statistics.items():
+            file.write(f"{key}: {value}\n")
+    return path
+
+def export_all(market_instance, n: int, inv_weight: float, fund_weight: float, market_weight: float,
+               file_format: str = 'csv', directory: str = EXPORT_DIRECTORY, max_workers: int = None) -> list:
+    #Exports the top investors, all investors, the market statistics and the top companies, returns the written paths
+    check_format(file_format)
+    os.makedirs(directory, exist_ok=True)
+
+    with profiling.stage(market_instance.profiler, 'export'):
+        return _export_all(market_instance, n, inv_weight, fund_weight, market_weight, file_format, directory, max_workers)
+
+def _export_all(market_instance, n, inv_weight, fund_weight, market_weight, file_format, directory, max_workers) -> list:
+    #Every frame is built once from data that is already loaded, the top 20 comes from a partial selection
+    registry = market_instance.investors
+    all_investors = registry.to_frame()
+    top_investors = registry.to_frame(registry.top_k(TOP_INVESTORS))[['Organization/Person Name', 'Region', 'Score']]
+    industry_statistics = pd.DataFrame(market_instance.industry_group_statistics).T
+    top_companies = market_instance.best_companies(n, inv_weight, fund_weight, market_weight)
+
+    jobs = [
+        (write_frame, top_investors, os.path.join(directory, 'Top_20_Investors_with_Region'), file_format),
+        (write_frame, all_investors, os.path.join(directory, 'All_Investors_with_Scores_and_Region'), file_format),
+        (write_frame, industry_statistics, os.path.join(directory, 'Industry_Group_Statistics'), file_format, 'Industry'),
+        (write_frame, top_companies, os.path.join(directory, 'Top_Companies'), file_format),
+        (write_overall_statistics, market_instance.overall_statistics, os.path.join(directory, 'Overall_Statistics.txt'))
+    ]
+    #The files are independent, serialization and disk writes overlap in a thread pool
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(job[0], *job[1:]) for job in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,114 @@
+#This files purpose is to keep the market statistics up to date when companies are added or updated by a delta file
+#Every statistic keeps its values sorted together with a running total, so count, mean and median stay exact
+#and a delta only touches the values (and industries) of the companies it contains
+
+import numpy as np
+import pandas as pd
+import compact
+
+STATISTIC_COLUMNS = ['Total Funding Amount (in USD)', 'Last Funding Amount (in USD)']
+
+class SortedStatistic:
+    #Exact count, mean and median of a changing set of numbers, missing values are ignored like pandas does
+    def __init__(self, values=()):
+        values = np.asarray(values, dtype=float)
+        self.values = np.sort(values[~np.isnan(values)])
+        self.total = float(self.values.sum())
+
+    def add(self, values):
+        values = np.sort(np.asarray(values, dtype=float))
+        values = values[~np.isnan(values)]
+        self.values = np.insert(self.values, np.searchsorted(self.values, values), values)
+        self.total += float(values.sum())
+
+    def remove(self, values):
+        values = np.sort(np.asarray(values, dtype=float))
+        values = values[~np.isnan(values)]
+        #Equal values are removed from consecutive slots
+        repeat = np.arange(len(values)) - np.searchsorted(values, values)
+        positions = np.searchsorted(self.values, values) + repeat
+        if len(positions) and (positions.max() >= len(self.values) or not np.array_equal(self.values[positions], values)):
+            raise ValueError('Cannot remove values that were never added')
+        self.values = np.delete(self.values, positions)
+        self.total -= float(values.sum())
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else float('nan')
+
+    def median(self) -> float:
+        if not self.count:
+            return float('nan')
+        return (self.values[(self.count - 1) // 2] + self.values[self.count // 2]) / 2
+
+class IncrementalAggregates:
+    #Overall and per industry statistics of Market, in the same format as Market.get_overall_statistics
+    #and Market.get_industry_group_statistics
+    def __init__(self, companies: pd.DataFrame, index):
+        self.overall = {column: SortedStatistic(companies[column]) for column in STATISTIC_COLUMNS}
+        self.industries = {}
+        self.members = {}
+        values = {column: companies[column].to_numpy(dtype=float) for column in STATISTIC_COLUMNS}
+        for industry in index.industries():
+            positions = index.company_positions(industry)
+            self.industries[industry] = {column: SortedStatistic(values[column][positions]) for column in STATISTIC_COLUMNS}
+            self.members[industry] = len(positions)
+
+    @staticmethod
+    def _industry_pairs(rows: pd.DataFrame) -> pd.DataFrame:
+        #One (industry, values) row per company and industry, an industry listed twice counts once
+        row_ids, industries = compact.flatten_lists(rows['Industry Groups'].reset_index(drop=True))
+        pairs = pd.DataFrame({'row': row_ids, 'industry': industries}).drop_duplicates()
+        for column in STATISTIC_COLUMNS:
+            pairs[column] = rows[column].to_numpy(dtype=float)[pairs['row'].to_numpy()]
+        return pairs
+
+    def _apply(self, rows: pd.DataFrame, sign: int):
+        for column in STATISTIC_COLUMNS:
+            if sign > 0:
+                self.overall[column].add(rows[column])
+            else:
+                self.overall[column].remove(rows[column])
+
+        for industry, pairs in self._industry_pairs(rows).groupby('industry', sort=False):
+            if industry not in self.industries:
+                self.industries[industry] = {column: SortedStatistic() for column in STATISTIC_COLUMNS}
+                self.members[industry] = 0
+            for column in STATISTIC_COLUMNS:
+                if sign > 0:
+                    self.industries[industry][column].add(pairs[column])
+                else:
+                    self.industries[industry][column].remove(pairs[column])
+            self.members[industry] += sign * len(pairs)
+            if self.members[industry] == 0:
+                del self.industries[industry], self.members[industry]
+
+    def update(self, old_rows: pd.DataFrame, new_rows: pd.DataFrame):
+        #old_rows are the previous versions of updated companies, new_rows the updated and inserted companies
+        self._apply(old_rows, -1)
+        self._apply(new_rows, 1)
+
+    def overall_statistics(self) -> dict:
+        total_funding, last_funding = (self.overall[column] for column in STATISTIC_COLUMNS)
+        return {
+            'mean_total_funding': int(total_funding.mean()),
+            'median_total_funding': int(total_funding.median()),
+            'mean_last_funding': int(last_funding.mean()),
+            'median_last_funding': int(last_funding.median())
+        }
+
+    def industry_group_statistics(self) -> dict:
+        simplified_stats = {}
+        for industry in sorted(self.industries):
+            total_funding, last_funding = (self.industries[industry][column] for column in STATISTIC_COLUMNS)
+            simplified_stats[industry] = {
+                'total_funding_mean': int(np.round(total_funding.mean())),
+                'total_funding_median': int(np.round(total_funding.median())),
+                'company_count': total_funding.count,
+                'last_funding_mean': int(np.round(last_funding.mean())),
+                'last_funding_median': int(np.round(last_funding.median()))
+            }
+        return simplified_stats
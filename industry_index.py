@@ -0,0 +1,70 @@
+#This files purpose is to index companies by industry without exploding the company data
+#The industry vocabulary is built once per load together with a sparse company x industry incidence matrix
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+import compact
+
+class IndustryIndex:
+    def __init__(self, industry_lists):
+        #Works on a Series of lists and on a compact ListColumn, every (company, industry) pair becomes one matrix entry
+        row_ids, industries = compact.flatten_lists(industry_lists)
+        codes, vocabulary = pd.factorize(industries) #Vocabulary in order of first appearance
+        matrix = sparse.csr_matrix((np.ones(len(codes), dtype=np.int8), (row_ids, codes)), shape=(len(industry_lists), len(vocabulary)))
+        matrix.sum_duplicates()
+        matrix.data[:] = 1 #An industry listed twice for the same company still counts once
+
+        self.vocabulary = pd.Index(vocabulary)
+        self.matrix = matrix
+        self.by_industry = matrix.tocsc()
+
+    def industries(self) -> list:
+        return self.vocabulary.tolist()
+
+    def industry_counts(self) -> np.ndarray:
+        #Number of industries per company
+        return np.diff(self.matrix.indptr)
+
+    def codes(self, industries) -> np.ndarray:
+        codes = self.vocabulary.get_indexer(list(industries))
+        unknown = [industry for industry, code in zip(industries, codes) if code < 0]
+        if unknown:
+            raise KeyError(f'Unknown industries: {unknown}')
+        return codes
+
+    def company_positions(self, industry: str) -> np.ndarray:
+        code = self.codes([industry])[0]
+        return self.by_industry.indices[self.by_industry.indptr[code]:self.by_industry.indptr[code + 1]]
+
+    def mask(self, industries, match: str = 'all') -> np.ndarray:
+        #Companies in all ("Fintech AND Software") or in any of the given industries
+        if match not in ('all', 'any'):
+            raise ValueError("match must be 'all' or 'any'")
+        hits = np.asarray(self.by_industry[:, self.codes(industries)].sum(axis=1)).ravel()
+        return hits == len(industries) if match == 'all' else hits > 0
+
+    def aggregate(self, values) -> pd.DataFrame:
+        #Count, mean and median of a numeric company column per industry, ignoring missing values like pandas does
+        values = np.asarray(values, dtype=float)
+        column_codes = np.repeat(np.arange(len(self.vocabulary)), np.diff(self.by_industry.indptr))
+        pair_values = values[self.by_industry.indices]
+        present = ~np.isnan(pair_values)
+        column_codes, pair_values = column_codes[present], pair_values[present]
+
+        counts = np.bincount(column_codes, minlength=len(self.vocabulary))
+        sums = np.bincount(column_codes, weights=pair_values, minlength=len(self.vocabulary))
+
+        #Sort the values inside every industry once, the median sits in the middle of each group
+        order = np.lexsort((pair_values, column_codes))
+        sorted_values = pair_values[order]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        medians = np.full(len(counts), np.nan)
+        has_values = counts > 0
+        lower = starts[has_values] + (counts[has_values] - 1) // 2
+        upper = starts[has_values] + counts[has_values] // 2
+        medians[has_values] = (sorted_values[lower] + sorted_values[upper]) / 2
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        return pd.DataFrame({'count': counts, 'mean': means, 'median': medians}, index=self.vocabulary)
@@ -1,59 +1,177 @@
 import pandas as pd
+import numpy as np
 import os
+import hashlib
+import exports
+
+def default_score(num_investments, num_exits):
+    #Works on single values and on whole arrays alike
+    return (num_investments * 1) + (num_exits * 2)
 
 class Investor:
+    __slots__ = ('name', 'num_investments', 'num_exits')
+
     def __init__(self, name, num_investments, num_exits):
         self.name = name
         self.num_investments = num_investments
         self.num_exits = num_exits
 
     def calculate_score(self):
-        return (self.num_investments * 1) + (self.num_exits * 2)
+        return default_score(self.num_investments, self.num_exits)
 
     def __str__(self):
         return f"Investor(name={self.name}, score={self.calculate_score()})"
 
-def investor_data_frame(file1='InputData/EU_Investors.csv', file2='InputData/US_Investors.csv'):
-    eu_investors = pd.read_csv(file1)
-    us_investors = pd.read_csv(file2)
-
-    combined_investor_data = pd.concat([eu_investors, us_investors])
-    combined_investor_data['Region'] = ['EU'] * len(eu_investors) + ['US'] * len(us_investors)
-
-    #Using list comprehension and polymorphism
-    investors = [
-        Investor(
-            name=row['Organization/Person Name'],
-            num_investments=row['Number of Investments'],
-            num_exits=row['Number of Exits']
+class InvestorView:
+    #Lightweight per-investor access into the registry arrays, nothing is copied
+    __slots__ = ('_registry', '_position')
+
+    def __init__(self, registry, position: int):
+        self._registry = registry
+        self._position = position
+
+    @property
+    def name(self):
+        return self._registry.names[self._position]
+
+    @property
+    def num_investments(self):
+        return self._registry.num_investments[self._position]
+
+    @property
+    def num_exits(self):
+        return self._registry.num_exits[self._position]
+
+    @property
+    def region(self):
+        return self._registry.regions[self._registry.region_codes[self._position]]
+
+    @property
+    def score(self):
+        return self._registry.scores[self._position]
+
+    def calculate_score(self):
+        return self.score
+
+    def __str__(self):
+        return f"Investor(name={self.name}, score={self.score})"
+
+class InvestorRegistry:
+    #All investors in contiguous typed arrays, with an O(1) name index and vectorized scoring
+    def __init__(self, names, num_investments, num_exits, region_codes, regions, score_formula=default_score):
+        self.names = np.asarray(names, dtype=object)
+        #Missing counts stay NaN, like in the CSV, so an investor without a count gets a NaN score instead of a huge negative one
+        self.num_investments = np.asarray(num_investments, dtype=np.float64)
+        self.num_exits = np.asarray(num_exits, dtype=np.float64)
+        self.region_codes = np.asarray(region_codes, dtype=np.int8)
+        self.regions = tuple(regions)
+        self.score_formula = score_formula
+        self.scores = np.asarray(score_formula(self.num_investments, self.num_exits), dtype=np.float64)
+
+        #Hash index over unique names, a duplicated name resolves to its first occurrence
+        first = ~pd.Index(self.names).duplicated()
+        self.name_index = pd.Index(self.names[first])
+        self.name_positions = np.flatnonzero(first)
+
+    @classmethod
+    def from_csv(cls, file1='InputData/EU_Investors.csv', file2='InputData/US_Investors.csv', score_formula=default_score):
+        eu_investors = pd.read_csv(file1)
+        us_investors = pd.read_csv(file2)
+        combined_investor_data = pd.concat([eu_investors, us_investors], ignore_index=True)
+        region_codes = np.repeat(np.arange(2, dtype=np.int8), [len(eu_investors), len(us_investors)])
+
+        return cls(
+            names=combined_investor_data['Organization/Person Name'].to_numpy(),
+            num_investments=combined_investor_data['Number of Investments'].to_numpy(),
+            num_exits=combined_investor_data['Number of Exits'].to_numpy(),
+            region_codes=region_codes,
+            regions=('EU', 'US'),
+            score_formula=score_formula
         )
-        for i, row in combined_investor_data.iterrows()
-    ]
 
-    combined_investor_data['Score'] = [inv.calculate_score() for inv in investors] 
+    def with_score_formula(self, score_formula):
+        #A registry over the same investors scored with another formula, the shared registry is left as it is
+        return InvestorRegistry(self.names, self.num_investments, self.num_exits, self.region_codes, self.regions, score_formula)
 
-    return combined_investor_data
+    def fingerprint(self) -> str:
+        #Identifies the investor list (names in registry order), used to key caches built on registry positions
+        return hashlib.sha256('\x00'.join(map(str, self.names)).encode('utf-8')).hexdigest()
 
-def get_top_20_investors(file1='InputData/EU_Investors.csv', file2='InputData/US_Investors.csv'):
-    # Use the investor_data_frame function to get combined investor data
-    us_eu_investors = investor_data_frame(file1, file2)
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, position: int) -> InvestorView:
+        return InvestorView(self, position)
+
+    def __contains__(self, name) -> bool:
+        return name in self.name_index
+
+    def get(self, name):
+        position = self.positions([name])[0]
+        return InvestorView(self, position) if position >= 0 else None
 
-    top_investors = sorted(us_eu_investors.itertuples(), key=lambda inv: inv.Score, reverse=True)[:20]
+    def positions(self, names) -> np.ndarray:
+        #Registry position for every name, -1 for unknown names
+        found = self.name_index.get_indexer(np.asarray(names, dtype=object))
+        return np.where(found >= 0, self.name_positions[found], -1)
 
-    top_investors_data = pd.DataFrame({
-        'Organization/Person Name': [inv._1 for inv in top_investors],  #where _1 is first column
-        'Region': [inv.Region for inv in top_investors],
-        'Score': [inv.Score for inv in top_investors],
-    })
+    def top_k(self, k: int, region: str = None) -> np.ndarray:
+        #Positions of the k highest scores via partial selection, ties keep file order and missing scores rank last
+        candidates = np.arange(len(self)) if region is None else np.flatnonzero(self.region_codes == self.regions.index(region))
+        if k <= 0:
+            return candidates[:0]
+        scores = np.nan_to_num(self.scores[candidates], nan=-np.inf)
+        if k < len(candidates):
+            threshold = -np.partition(-scores, k - 1)[k - 1]
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+            selected = np.concatenate([above, ties])
+        else:
+            selected = np.arange(len(candidates))
+        selected = selected[np.lexsort((selected, -scores[selected]))]
+        return candidates[selected]
+
+    def to_frame(self, positions=None) -> pd.DataFrame:
+        positions = np.arange(len(self)) if positions is None else np.asarray(positions)
+        num_investments = self.num_investments[positions]
+        if not np.isnan(num_investments).any():
+            num_investments = num_investments.astype(np.int64) #Whole counts are shown as integers, like pandas reads them
+        return pd.DataFrame({
+            'Organization/Person Name': self.names[positions],
+            'Number of Investments': num_investments,
+            'Number of Exits': self.num_exits[positions],
+            'Region': np.asarray(self.regions, dtype=object)[self.region_codes[positions]],
+            'Score': self.scores[positions]
+        })
+
+#One registry per pair of investor files for the whole process
+_registries = {}
+
+def get_registry(file1='InputData/EU_Investors.csv', file2='InputData/US_Investors.csv') -> InvestorRegistry:
+    key = (os.path.abspath(file1), os.path.abspath(file2))
+    if key not in _registries:
+        _registries[key] = InvestorRegistry.from_csv(file1, file2)
+    return _registries[key]
+
+def investor_data_frame(file1='InputData/EU_Investors.csv', file2='InputData/US_Investors.csv'):
+    return get_registry(file1, file2).to_frame()
+
+def get_top_20_investors(file1='InputData/EU_Investors.csv', file2='InputData/US_Investors.csv'):
+    registry = get_registry(file1, file2)
+    us_eu_investors = registry.to_frame()
+    top_investors_data = registry.to_frame(registry.top_k(20))[['Organization/Person Name', 'Region', 'Score']]
 
     return top_investors_data, us_eu_investors  # Return both dataframes for further processing
 
-def export_investor_data(scope):
+def export_investor_data(scope, file_format='csv', directory=exports.EXPORT_DIRECTORY):
+    #Written by exports.write_frame, like every other export
+    exports.check_format(file_format)
+    os.makedirs(directory, exist_ok=True)
     if scope == 'top_20':
         top_20_df, _ = get_top_20_investors('InputData/EU_Investors.csv', 'InputData/US_Investors.csv')
-        top_20_df.to_csv('Exports/Top_20_Investors_with_Region.csv', index=False)
+        return exports.write_frame(top_20_df, os.path.join(directory, 'Top_20_Investors_with_Region'), file_format)
     elif scope == 'all':
         all_investors_df = investor_data_frame('InputData/EU_Investors.csv', 'InputData/US_Investors.csv')
-        all_investors_df.to_csv('Exports/All_Investors_with_Scores_and_Region.csv', index=False)
+        return exports.write_frame(all_investors_df, os.path.join(directory, 'All_Investors_with_Scores_and_Region'), file_format)
     else:
         raise ValueError("Invalid scope. Please specify 'top_20' or 'all'.")
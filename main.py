@@ -1,9 +1,7 @@
 import os
-from rapidfuzz import process
-import investor
-import market
-import visualizer
 import warnings
+#market, investor, visualizer and rapidfuzz pull in pandas, sklearn, matplotlib and seaborn
+#They are imported inside the menu options that need them, so the menu shows up without loading any of them
 
 warnings.filterwarnings("ignore")
 
@@ -26,7 +24,7 @@ def menu():
     print("8. FAQ - Frequently Asked Questions")
     print("9. Exit Program")
     
-def main():
+def main(profiler=None):
     create_exports_directory()
     market_instance = None
     n = 0
@@ -41,6 +39,7 @@ def main():
         choice = int(input("Enter the number of the operation you want to perform: \n"))
 
         if choice == 1: #Load Data
+            import market
             print("Do you want to load data or use existing data?")
             print("1. Load Data")
             print("2. Existing Seed Data")
@@ -48,15 +47,21 @@ def main():
             data_choice = int(input("Enter the number of the operation you want to perform: "))
             if data_choice == 1:
                 file_path = input("Enter the path to the CSV file: ")
-                market_instance = market.Market(file_path)
+                market_instance = market.Market(file_path, profiler=profiler)
             elif data_choice == 2:
-                market_instance = market.Market('InputData/Seed_Europe_min2mio_companies-25-11-2024.csv')
+                market_instance = market.Market('InputData/Seed_Europe_min2mio_companies-25-11-2024.csv', profiler=profiler)
             elif data_choice == 3:
-                market_instance = market.Market('InputData/seriesA_Europe_companies-25-11-2024.csv')
+                market_instance = market.Market('InputData/seriesA_Europe_companies-25-11-2024.csv', profiler=profiler)
+
+            if data_choice in (1, 2, 3):
+                if market_instance.has_cached_model():
+                    print("Data loaded, the cached predictive model for this file will be reused.")
+                else:
+                    print("Data loaded, the predictive model will be trained and cached the first time it is needed.")
         
         elif choice == 2: #View Overall Market Statistics
             if market_instance:
-                for key, value in market_instance.get_overall_statistics().items():
+                for key, value in market_instance.overall_statistics.items():
                     print(f"{key.title()}: {value}")
             else:
                 print("No data loaded. Please load data first.")
@@ -77,6 +82,8 @@ def main():
         
         elif choice == 4: #Visualize Industry Group Statistics
             if market_instance: 
+                from rapidfuzz import process
+                import visualizer
                 stats = market_instance.industry_group_statistics
                 industries = market_instance.get_industry_list()
                 user_input = input("Enter Industries you want to visualize, sepearted by commas: ")
@@ -93,6 +100,7 @@ def main():
                 print("No data loaded. Please load data first.")
         
         elif choice == 5: #View Top 20 Investors
+            import visualizer
             visualizer.visualize_top_20_investors()
         
         elif choice == 6: #Find Best Companies
@@ -114,10 +122,13 @@ def main():
         
         elif choice == 7: #Export Data
             if market_instance: 
-                investor.export_investor_data('top_20')
-                investor.export_investor_data('all')
-                market_instance.export_market_data()
-                market_instance.export_top_companies(n, inv_weight, fund_weight, market_weight)
+                import exports
+                file_format = input("Enter the export format (csv, jsonl or parquet) [csv]: ").strip().lower() or 'csv'
+                try:
+                    written = exports.export_all(market_instance, n, inv_weight, fund_weight, market_weight, file_format)
+                    print(f"Exported {len(written)} files to the Exports folder.")
+                except (ValueError, ImportError) as error:
+                    print(error)
             else:
                 print("No data loaded. Please load data first.")
         
@@ -138,5 +149,23 @@ def main():
         else:
             print("Invalid choice. Please try again.")
 
+def parse_arguments():
+    import argparse
+    parser = argparse.ArgumentParser(description="VC Market Analysis Tool")
+    parser.add_argument('--profile', nargs='?', const='', metavar='REPORT.json',
+                        help="Measure every stage and print a report on exit, optionally also saved as JSON")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="Also record peak memory per stage with --profile (makes every stage several times slower)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    arguments = parse_arguments()
+    profiler = None
+    if arguments.profile is not None:
+        import profiling
+        profiler = profiling.Profiler(track_memory=arguments.profile_memory)
+    main(profiler)
+    if profiler is not None:
+        print(profiler.format_report())
+        if arguments.profile:
+            profiler.save(arguments.profile)
\ No newline at end of file
@@ -1,40 +1,274 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import cross_val_score
 import json
+import os
+import tempfile
 import utils
 import investor
+import scoring
+import model_cache
+import schema
+import data_cache
+import streaming
+import resolution
+import industry_index
+import compact
+import incremental
+import model_backends
+import profiling
+import exports
+
+CV_FOLDS = 5
+PREDICT_BATCH_SIZE = 100_000 #Rows turned into features at once by Market.predict
+FEATURE_COLUMNS = ['days_since_founding', 'days_since_founding_log', 'total_funding', 'funding_rounds',
+                   'avg_funding_per_round', 'funding_velocity', 'industry_count']
+
+#Delta ingestion retrains once this share of the rows changed since the last training, or the median last funding drifted this much
+RETRAIN_ROW_FRACTION = 0.1
+RETRAIN_DRIFT = 0.1
+WARM_START_TREES = 20 #Trees added to the forest by a retraining after a delta
+
+#Artifacts computed from cleaned_df, they are dropped whenever the company data is replaced
+DATA_ARTIFACTS = ('industry_index', 'overall_statistics', 'industry_group_statistics', 'predictive_model', 'fitted_model', 'investor_aliases',
+                  'investor_score_sums', 'url_index', 'incremental_aggregates', 'score_components')
+
+def prediction_features(companies: pd.DataFrame, industry_counts) -> pd.DataFrame:
+    X = pd.DataFrame(index=companies.index)
+
+    # Date columns are already parsed to datetime by utils.clean_data
+    X['days_since_founding'] = (companies['Last Funding Date'] - companies['Founded Date']).dt.days
+    X['days_since_founding_log'] = np.log1p(X['days_since_founding'])
+
+    # Add funding-related features
+    X['total_funding'] = companies['Total Funding Amount (in USD)']
+    X['funding_rounds'] = companies['Number of Funding Rounds']
+    X['avg_funding_per_round'] = X['total_funding'] / X['funding_rounds']
+    X['funding_velocity'] = X['total_funding'] / X['days_since_founding']
+
+    # Add industry count as a feature instead of dummies
+    X['industry_count'] = industry_counts
+    return X
 
 class Market:
-    def __init__(self, file_path: str):
-        self.raw_df = pd.read_csv(file_path)
-        self.file_validity()
-        self.cleaned_df = utils.clean_data(self.raw_df)
-        self.investors = investor.investor_data_frame()
-        self.overall_statistics = self.get_overall_statistics()
-        self.industry_group_statistics = self.industry_group_statistics()
-        self.predictive_model = self.train_predictive_model()
+    def __init__(self, file_path: str, use_model_cache: bool = True, use_data_cache: bool = True,
+                 min_alias_confidence: float = resolution.DEFAULT_MIN_CONFIDENCE, compact: bool = False,
+                 model_backend: str = model_backends.DEFAULT_BACKEND, n_jobs: int = -1, profiler: profiling.Profiler = None):
+        model_backends.backend_spec(model_backend) #Fail on an unknown backend before anything is loaded
+        self.file_path = file_path
+        self.use_model_cache = use_model_cache
+        self.use_data_cache = use_data_cache
+        self.min_alias_confidence = min_alias_confidence
+        self.compact = compact #Store the company data in the memory-compact layout of compact.py
+        self.model_backend = model_backend
+        self.n_jobs = n_jobs #Cores used for training and cross-validation, -1 uses all of them
+        self.profiler = profiler #Records every stage below when set, see profiling.py
+
+        #Everything below is computed on first access and memoized, so loading only costs parsing and validation
+        self._artifacts = {}
+        self._cleaned_df = None
+        self._compact_data = None
+        self._data_from_file = True
+        self.keep_rows = True
+
+        #The header check only reads the first line and the funding type check only the first chunk,
+        #so a file in the wrong layout or with mixed rounds at the start is rejected before it is hashed
+        with self._stage('validate_head'):
+            schema.validate_header(file_path)
+            schema.validate_funding_type(file_path, max_chunks=1)
+
+        #A cached copy of this exact file was validated and cleaned before, so the rest of validation and cleaning are skipped
+        cached = None
+        if use_data_cache:
+            with self._stage('data_cache_load') as record:
+                cached = data_cache.load(file_path, data_cache.cache_key(self.file_hash))
+                record.rows = len(cached[0]) if cached is not None else None
+        if cached is None:
+            self.file_validity()
+        else:
+            self._cleaned_df, self.funding_round = cached
+
+    @classmethod
+    def from_stream(cls, file_path: str, chunksize: int = streaming.DEFAULT_CHUNKSIZE,
+                    relative_accuracy: float = streaming.DEFAULT_RELATIVE_ACCURACY, keep_rows: bool = False, profiler: profiling.Profiler = None):
+        #Streaming load for exports too large for memory: the file is read in chunks and the statistics are built incrementally
+        #Medians are approximate within relative_accuracy, without keep_rows only the statistics are available
+        market = cls(file_path, use_data_cache=False, profiler=profiler)
+        with market._stage('stream_file') as record:
+            aggregates, cleaned_df = streaming.stream_file(file_path, chunksize, relative_accuracy, keep_rows)
+            record.rows = aggregates.total_funding.count
+        market.keep_rows = keep_rows
+        market._cleaned_df = cleaned_df
+        market._artifacts['overall_statistics'] = aggregates.overall_statistics()
+        market._artifacts['industry_group_statistics'] = aggregates.industry_group_statistics()
+        return market
+
+    def _stage(self, name: str, rows: int = None):
+        return profiling.stage(self.profiler, name, rows)
+
+    def _artifact(self, name: str, build):
+        #Building an artifact is a profiled stage of its own, named after the artifact
+        if name not in self._artifacts:
+            with self._stage(name) as record:
+                self._artifacts[name] = build()
+                if hasattr(self._artifacts[name], 'shape'):
+                    record.rows = self._artifacts[name].shape[0]
+        return self._artifacts[name]
+
+    def invalidate(self, *names: str):
+        #Drop memoized artifacts so they are rebuilt on next access, without names all data dependent artifacts are dropped
+        for name in names or DATA_ARTIFACTS:
+            self._artifacts.pop(name, None)
+
+    @property
+    def raw_df(self):
+        return self._artifact('raw_df', lambda: pd.read_csv(self.file_path, dtype=schema.read_dtypes()))
+
+    @property
+    def cleaned_df(self):
+        if self._cleaned_df is None and not self.keep_rows:
+            raise ValueError('This market was streamed without keep_rows, only the overall and industry statistics are available')
+        if self._cleaned_df is None:
+            raw_df = self.raw_df
+            with self._stage('clean_data', len(raw_df)):
+                self._cleaned_df = utils.clean_data(raw_df)
+            if self.use_data_cache:
+                try:
+                    with self._stage('data_cache_save', len(self._cleaned_df)):
+                        data_cache.save(self.file_path, data_cache.cache_key(self.file_hash), self._cleaned_df, self.funding_round)
+                except (OSError, ValueError):
+                    pass #The cache only speeds up the next load, failing to write it must not fail this one
+        if self.compact and self._compact_data is None:
+            with self._stage('compact', len(self._cleaned_df)):
+                self._compact_data = compact.CompactData.from_frame(self._cleaned_df, self._side_store_directory())
+                self._cleaned_df = self._compact_data.frame
+        return self._cleaned_df
+
+    @cleaned_df.setter
+    def cleaned_df(self, df: pd.DataFrame):
+        self._cleaned_df = df
+        self._compact_data = None
+        self._data_from_file = False #The file hash no longer describes the data, so the model cache is bypassed
+        self.invalidate()
+
+    def _side_store_directory(self):
+        #Descriptions of file data are kept next to the other caches, replaced data gets a private temporary directory
+        if not (self.use_data_cache and self._data_from_file):
+            self._side_store_tmp = tempfile.TemporaryDirectory(prefix='market-text-') #Removed together with this Market
+            return self._side_store_tmp.name
+        os.makedirs(compact.CACHE_DIR, exist_ok=True)
+        entry_path = os.path.join(compact.CACHE_DIR, f"{utils.source_id(self.file_path)}-{data_cache.cache_key(self.file_hash)}")
+        utils.evict_stale_entries(compact.CACHE_DIR, self.file_path, entry_path, compact.MAX_ENTRIES)
+        return entry_path
+
+    def list_column(self, column: str):
+        #A list column (Founders, Top 5 Investors, Industry Groups), as a compact.ListColumn in compact mode
+        cleaned_df = self.cleaned_df
+        if self._compact_data is not None:
+            return self._compact_data.list_columns[column]
+        return cleaned_df[column]
+
+    def rows(self, positions):
+        #Full company rows in the regular layout for the given positions, compact mode only expands these rows
+        cleaned_df = self.cleaned_df
+        if self._compact_data is not None:
+            return self._compact_data.rows(positions, cleaned_df)
+        return cleaned_df.iloc[positions].copy()
+
+    def memory_usage(self):
+        #Bytes held in memory by the company data, including the strings inside the list columns
+        cleaned_df = self.cleaned_df
+        if self._compact_data is not None:
+            return self._compact_data.memory_usage()
+        return compact.frame_memory_usage(cleaned_df)
+
+    @property
+    def investors(self):
+        #The process wide investor registry, unless a custom one (e.g. another score formula) was assigned
+        return self._artifact('investors', investor.get_registry)
+
+    @investors.setter
+    def investors(self, registry: investor.InvestorRegistry):
+        self._artifacts['investors'] = registry
+        self.invalidate('investor_aliases', 'investor_score_sums', 'score_components')
+
+    @property
+    def investor_aliases(self):
+        #Resolved (company investor string -> registry investor) table, built once per load and cached on disk
+        return self._artifact('investor_aliases', self.resolve_investor_aliases)
+
+    def resolve_investor_aliases(self):
+        use_cache = self.use_data_cache and self._data_from_file
+        key = resolution.cache_key(self.file_hash, self.investors, self.min_alias_confidence)
+        table = resolution.load(self.file_path, key) if use_cache else None
+        if table is None:
+            table = resolution.resolve_aliases(compact.flatten_lists(self.list_column('Top 5 Investors'))[1], self.investors, self.min_alias_confidence)
+            if use_cache:
+                resolution.save(self.file_path, key, table)
+        return resolution.AliasIndex(table)
+
+    @property
+    def investor_score_sums(self):
+        #Raw (not normalized) investor score sum per company, kept so a delta only rescores its own rows
+        return self._artifact('investor_score_sums', lambda: scoring.investor_score_sum(self.list_column('Top 5 Investors'), self.investors, self.investor_aliases))
+
+    @property
+    def industry_index(self):
+        #Industry vocabulary and sparse company x industry matrix, shared by every industry feature
+        return self._artifact('industry_index', lambda: industry_index.IndustryIndex(self.list_column('Industry Groups')))
+
+    @property
+    def overall_statistics(self):
+        return self._artifact('overall_statistics', self.get_overall_statistics)
+
+    @property
+    def industry_group_statistics(self):
+        return self._artifact('industry_group_statistics', self.get_industry_group_statistics)
+
+    @property
+    def predictive_model(self):
+        return self._artifact('predictive_model', self.train_predictive_model)
+
+    @property
+    def model(self):
+        return self._fitted_model()['model']
+
+    @property
+    def scaler(self):
+        return self._fitted_model()['scaler']
+
+    @property
+    def feature_columns(self):
+        return self._fitted_model()['feature_columns']
+
+    @property
+    def model_cache_hit(self):
+        return self._fitted_model()['cache_hit']
+
+    def _fitted_model(self):
+        self.predictive_model #Trains (or loads) the model if that has not happened yet
+        return self._artifacts['fitted_model']
+
+    @property
+    def file_hash(self):
+        return self._artifact('file_hash', lambda: utils.file_fingerprint(self.file_path))
+
+    def has_cached_model(self):
+        #Whether a model for this exact file and settings is already on disk, without training anything
+        key = model_cache.cache_key(self.file_hash, FEATURE_COLUMNS, model_backends.cache_settings(self.model_backend), CV_FOLDS)
+        return self.use_model_cache and self._data_from_file and model_cache.exists(self.file_path, key)
         
     #First check whether the file is valid for this application (Crunchbase format)    
     def file_validity(self):
-        benchmark_file = pd.read_csv('InputData/seriesA_Europe_companies-25-11-2024.csv')
-        if list(self.raw_df.columns) == list(benchmark_file.columns):
-            pass
-        else:
-            raise ValueError('File is not valid, the column layout is not compatible with this application')
-        
-        #Check whether the file is all of the same funding round (e.g. Series A)
-        if len(self.raw_df['Last Funding Type'].unique()) == 1:
-            pass
-        else:
-            raise ValueError('File is not valid, there is a mix of different funding rounds')
+        #Funding round check against the declarative schema (the header was checked on load), before the full file is parsed
+        with self._stage('validate'):
+            self.funding_round = schema.validate_funding_type(self.file_path)
         
     def get_industry_list(self):
-        exploded_df = self.cleaned_df.explode('Industry Groups')
-        unique_industries = exploded_df['Industry Groups'].unique().tolist()
-        return unique_industries
+        return self.industry_index.industries()
+
+    def companies_in_industries(self, *industries: str, match: str = 'all'):
+        #Companies listed in all (match='all', e.g. Fintech AND Software) or any (match='any') of the given industries
+        return self.rows(np.flatnonzero(self.industry_index.mask(industries, match)))
         
     def get_overall_statistics(self):
         #Total Funding Stats
@@ -52,133 +286,256 @@ class Market:
         all_stats = {**total_funding_stats, **last_funding_stats} #Using Kwargs to unpack the dictionaries
         return all_stats
     
-    def industry_group_statistics(self):
-        # Create a new dataframe with exploded industry groups since there are multiple industries per company
-        exploded_df = self.cleaned_df.explode('Industry Groups')
-        
-        # Group by individual industries and calculate statistics
-        industry_stats = exploded_df.groupby('Industry Groups').agg({
-            'Total Funding Amount (in USD)': ['mean', 'median', 'count'],
-            'Last Funding Amount (in USD)': ['mean', 'median']
-        }).round(0)
+    def get_industry_group_statistics(self):
+        # Aggregate per industry straight from the company x industry matrix, no exploded copy of the data is made
+        total_funding = self.industry_index.aggregate(self.cleaned_df['Total Funding Amount (in USD)']).round(0)
+        last_funding = self.industry_index.aggregate(self.cleaned_df['Last Funding Amount (in USD)']).round(0)
         
         simplified_stats = {}
-        for industry in industry_stats.index: #Using index to get the unique industry name
+        for industry in sorted(self.industry_index.industries()):
             simplified_stats[industry] = {
-                'total_funding_mean': int(industry_stats.loc[industry,  ('Total Funding Amount (in USD)', 'mean')]),
-                'total_funding_median': int(industry_stats.loc[industry, ('Total Funding Amount (in USD)', 'median')]),
-                'company_count': int(industry_stats.loc[industry, ('Total Funding Amount (in USD)', 'count')]),
-                'last_funding_mean': int(industry_stats.loc[industry, ('Last Funding Amount (in USD)', 'mean')]),
-                'last_funding_median': int(industry_stats.loc[industry, ('Last Funding Amount (in USD)', 'median')])
+                'total_funding_mean': int(total_funding.loc[industry, 'mean']),
+                'total_funding_median': int(total_funding.loc[industry, 'median']),
+                'company_count': int(total_funding.loc[industry, 'count']),
+                'last_funding_mean': int(last_funding.loc[industry, 'mean']),
+                'last_funding_median': int(last_funding.loc[industry, 'median'])
             }
 
         return simplified_stats
     
     def train_predictive_model(self):
-        X = pd.DataFrame()
-
-        # Convert date columns to datetime before subtraction
-        self.cleaned_df['Last Funding Date'] = pd.to_datetime(self.cleaned_df['Last Funding Date'])
-        self.cleaned_df['Founded Date'] = pd.to_datetime(self.cleaned_df['Founded Date'])
-        
-        X['days_since_founding'] = (self.cleaned_df['Last Funding Date'] - self.cleaned_df['Founded Date']).dt.days
-        X['days_since_founding_log'] = np.log1p(X['days_since_founding'])
-        
-        # Add funding-related features
-        X['total_funding'] = self.cleaned_df['Total Funding Amount (in USD)']
-        X['funding_rounds'] = self.cleaned_df['Number of Funding Rounds']
-        X['avg_funding_per_round'] = X['total_funding'] / X['funding_rounds']
-        X['funding_velocity'] = X['total_funding'] / X['days_since_founding']
-        
-        # Add industry count as a feature instead of dummies
-        X['industry_count'] = self.cleaned_df['Industry Groups'].apply(lambda x: len(x) if x is not None else 0)
+        X = prediction_features(self.cleaned_df, self.industry_index.industry_counts())
 
         # Target variable: Last funding amount
         y = self.cleaned_df['Last Funding Amount (in USD)']
 
-        # Scale features
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        
-        # Train model
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X_scaled, y)
+        # Reuse a model trained earlier on the exact same file, features and hyperparameters
+        key = model_cache.cache_key(self.file_hash, X.columns, model_backends.cache_settings(self.model_backend), CV_FOLDS)
+        use_cache = self.use_model_cache and self._data_from_file
+        cached = None
+        if use_cache:
+            with self._stage('model_cache_load'):
+                cached = model_cache.load(self.file_path, key)
+        cache_hit = cached is not None
+
+        if cached is None:
+            # sklearn is only imported when a model actually has to be trained, loading data and cache hits never need it
+            from sklearn.preprocessing import StandardScaler
+            from sklearn.model_selection import cross_val_score
+
+            # Scale features
+            scaler = StandardScaler()
+            X_scaled = scaler.fit_transform(X)
+
+            # Train model
+            model = model_backends.make_model(self.model_backend, self.n_jobs)
+            with self._stage('model_fit', len(X)):
+                model.fit(X_scaled, y)
+
+            # Calculate performance using cross-validation, the folds are fitted in parallel
+            with self._stage('cross_validation', len(X)):
+                cv_scores = cross_val_score(model_backends.cross_validation_model(model, self.model_backend), X_scaled, y, cv=CV_FOLDS, n_jobs=self.n_jobs)
+
+            cached = {
+                'model': model,
+                'scaler': scaler,
+                'feature_columns': X.columns,
+                'cross_val_scores': cv_scores,
+                'predictions': model.predict(X_scaled)
+            }
+            if use_cache:
+                with self._stage('model_cache_save'):
+                    model_cache.save(self.file_path, key, cached)
 
         # Add predictions to cleaned_df
-        self.cleaned_df['Expected Next Funding'] = model.predict(X_scaled)
+        self.cleaned_df['Expected Next Funding'] = cached['predictions']
         
         self.cleaned_df['Funding Difference'] = self.cleaned_df['Expected Next Funding'] - self.cleaned_df['Last Funding Amount (in USD)']
         
         # Store model and scaler if needed for future predictions
-        self.model = model
-        self.scaler = scaler
-        self.feature_columns = X.columns
-        
-        # Calculate performance using cross-validation
-        cv_scores = cross_val_score(model, X_scaled, y, cv=5)
+        self._artifacts['fitted_model'] = {**cached, 'cache_hit': cache_hit, 'training_rows': len(X), 'rows_since_training': 0,
+                                           'training_median': float(y.median())}
         
         return {
-            'cross_val_scores': cv_scores,
-            'mean_cv_score': cv_scores.mean(),
-            'feature_importance': dict(zip(X.columns, model.feature_importances_))
+            'cross_val_scores': cached['cross_val_scores'],
+            'mean_cv_score': cached['cross_val_scores'].mean(),
+            'feature_importance': model_backends.feature_importance(cached['model'], cached['feature_columns'])
         }
     
+    @profiling.profiled('predict')
+    def predict(self, companies: pd.DataFrame, batch_size: int = PREDICT_BATCH_SIZE, positions=None) -> np.ndarray:
+        #Expected next funding for any companies, with the fitted scaler and model of this market
+        #Takes rows in the raw Crunchbase layout or cleaned by utils.clean_data, large frames are processed in batches
+        #Rows of this market's compact cleaned_df have no Industry Groups column, their positions in cleaned_df must be passed
+        fitted = self._fitted_model()
+        if 'Industry Groups' not in companies.columns:
+            if companies is self._cleaned_df and self._compact_data is not None:
+                positions = np.arange(len(companies))
+            if positions is None or self._compact_data is None:
+                raise ValueError("Companies without an 'Industry Groups' column must be rows of this market's compact cleaned_df, pass their positions")
+            positions = np.asarray(positions)
+            if len(positions) != len(companies):
+                raise ValueError(f"Got {len(positions)} positions for {len(companies)} companies")
+            industry_counts = self.industry_index.industry_counts()[positions]
+        predictions = np.empty(len(companies), dtype=float)
+        for start in range(0, len(companies), batch_size):
+            batch = companies.iloc[start:start + batch_size]
+            if not pd.api.types.is_datetime64_any_dtype(batch['Founded Date']):
+                batch = utils.clean_data(batch)
+            if 'Industry Groups' in batch.columns:
+                batch_counts = industry_index.IndustryIndex(batch['Industry Groups']).industry_counts()
+            else:
+                batch_counts = industry_counts[start:start + batch_size]
+            X = prediction_features(batch, batch_counts)
+            predictions[start:start + batch_size] = fitted['model'].predict(fitted['scaler'].transform(X[fitted['feature_columns']]))
+        return predictions
+
+    @property
+    def score_components(self):
+        #Normalized investor, funding difference and market context scores as whole columns, shared by every ranking and export
+        def build():
+            self.predictive_model #The funding difference score needs the model predictions
+            return scoring.score_components(self.cleaned_df, self.investor_score_sums, self.overall_statistics)
+        return self._artifact('score_components', build)
+
+    @profiling.profiled('best_companies')
     def best_companies(self, n: int, inv_weight: float, fund_weight: float, market_weight: float):
-        desired_amount = n
-        companies = self.cleaned_df
-        
-        #Get the investor score sum
-        companies['Investor Score Sum'] = 0
-        
-        for index, row in companies.iterrows():
-            investor_list = row['Top 5 Investors'] if isinstance(row['Top 5 Investors'], list) else []
-            
-            investor_scores = [self.investors.loc[self.investors['Organization/Person Name'] == investor, 'Score'].values[0] 
-                               for investor in investor_list if investor in self.investors['Organization/Person Name'].values]
-            companies.at[index, 'Investor Score Sum'] = sum(investor_scores)
-        
-        #Normalize the investor score sum
-        companies['Investor Score Sum'] = companies['Investor Score Sum'] / companies['Investor Score Sum'].max()
-    
-        #Normalize Funding Difference
-        companies['Funding Difference'] = companies['Funding Difference'] / companies['Funding Difference'].max()
+        #Peform Overall Score based on the weights
+        components = self.score_components.assign(**{'Overall Score': scoring.overall_score(self.score_components, inv_weight, fund_weight, market_weight)})
 
+        #Rank on the score columns only and return a fresh view, cleaned_df itself is never modified
+        top_n_positions = components['Overall Score'].sort_values(ascending=False).index[:n]
+        top_n_companies = self.rows(top_n_positions)
+        for column in components.columns:
+            top_n_companies[column] = components[column].to_numpy()[top_n_positions]
+        return top_n_companies
 
-        #Perform Overall Market Context Score based on overall statistics
-        companies['Market Context Score'] = 0
+    @profiling.profiled('best_companies_sweep')
+    def best_companies_sweep(self, n: int, weights):
+        #Rank the companies for a whole matrix of (inv_weight, fund_weight, market_weight) rows in one pass
+        weights = scoring.sweep_weights(weights, n) #Checked before the scores (and possibly the model) are built
+        components = self.score_components
+        top_positions, top_scores = scoring.weight_sweep(components, weights, n)
+        overlap = scoring.rank_overlap(top_positions, len(components))
 
-        for index, row in companies.iterrows():
-            total_fund_median = self.overall_statistics['median_total_funding']
-            last_fund_median = self.overall_statistics['median_last_funding']
-            
-            # Calculate scores based on total funding and last funding
-            total_funding_score = row['Total Funding Amount (in USD)'] / total_fund_median
-            last_funding_score = row['Last Funding Amount (in USD)'] / last_fund_median
-            
-            # Average the two scores
-            companies.at[index, 'Market Context Score'] = (total_funding_score + last_funding_score) / 2
+        weights_df = pd.DataFrame(weights, columns=['inv_weight', 'fund_weight', 'market_weight'])
+        ranks = [f'Rank {rank}' for rank in range(1, top_positions.shape[0] + 1)]
+        names = self.cleaned_df['Organization Name'].to_numpy()
 
-        #Peform Overall Score based on the weights
-        companies['Overall Score'] = 0
-        companies['Overall Score'] = (companies['Investor Score Sum'] * inv_weight) + (companies['Funding Difference'] * fund_weight) + (companies['Market Context Score'] * market_weight)
+        return {
+            'weights': weights_df,
+            'rankings': pd.DataFrame(names[top_positions].T, columns=ranks),
+            'scores': pd.DataFrame(top_scores.T, columns=ranks),
+            'overlap': pd.DataFrame(overlap['overlap']),
+            'jaccard': pd.DataFrame(overlap['jaccard'])
+        }
 
-        sorted_companies = companies.sort_values(by='Overall Score', ascending=False).copy()
-        top_n_companies = sorted_companies[:n]
-        return top_n_companies
+    @profiling.profiled('apply_delta')
+    def apply_delta(self, delta_path: str, retrain_row_fraction: float = RETRAIN_ROW_FRACTION, retrain_drift: float = RETRAIN_DRIFT):
+        #Upsert the companies of a delta export by Organization Name URL without rebuilding the market
+        #Statistics, investor scores and predictions are only updated for the companies in the delta, the model is
+        #retrained (by adding WARM_START_TREES trees) once enough rows changed or the median last funding drifted
+        if self.compact:
+            raise ValueError('apply_delta needs the regular data layout, load the market with compact=False')
+        delta_round = schema.validate_file(delta_path)
+        if delta_round != self.funding_round:
+            raise ValueError(f"The delta holds {delta_round} companies, but this market holds {self.funding_round} companies")
+        delta = utils.clean_data(pd.read_csv(delta_path, dtype=schema.read_dtypes()))
+        delta = delta.drop_duplicates('Organization Name URL', keep='last').reset_index(drop=True)
+
+        #State the delta is applied to, built once for the current data
+        self.predictive_model
+        aggregates = self._artifact('incremental_aggregates', lambda: incremental.IncrementalAggregates(self.cleaned_df, self.industry_index))
+        url_index = self._artifact('url_index', lambda: pd.Index(self.cleaned_df['Organization Name URL']))
+        investor_score_sums = self.investor_score_sums
+        fitted = self._artifacts['fitted_model']
+        cleaned_df = self.cleaned_df
+
+        positions = url_index.get_indexer(delta['Organization Name URL'])
+        updated = positions >= 0
+        aggregates.update(cleaned_df.iloc[positions[updated]], delta)
+
+        #Investor names never seen in this market are resolved on their own and added to the alias index
+        aliases = self.investor_aliases
+        _, names = compact.flatten_lists(delta['Top 5 Investors'])
+        unseen = names[aliases.aliases.get_indexer(names) < 0]
+        if len(unseen):
+            aliases = aliases.extend(resolution.resolve_aliases(unseen, self.investors, self.min_alias_confidence))
+            self._artifacts['investor_aliases'] = aliases
+        delta_score_sums = scoring.investor_score_sum(delta['Top 5 Investors'], self.investors, aliases)
+
+        delta['Expected Next Funding'] = self.predict(delta)
+        delta['Funding Difference'] = delta['Expected Next Funding'] - delta['Last Funding Amount (in USD)']
+        delta = delta[cleaned_df.columns]
+
+        #Updated companies are overwritten in place, new companies are appended
+        for column_position, column in enumerate(cleaned_df.columns):
+            cleaned_df.iloc[positions[updated], column_position] = delta[column].to_numpy()[updated]
+        investor_score_sums[positions[updated]] = delta_score_sums[updated]
+        self._cleaned_df = pd.concat([cleaned_df, delta[~updated]], ignore_index=True)
+        self._artifacts['investor_score_sums'] = np.concatenate([investor_score_sums, delta_score_sums[~updated]])
+        self._artifacts['url_index'] = url_index.append(pd.Index(delta['Organization Name URL'][~updated]))
+
+        #The file no longer describes the data, so the file keyed caches are bypassed from now on
+        self._data_from_file = False
+        self.invalidate('raw_df', 'industry_index', 'score_components')
+        self._artifacts['overall_statistics'] = aggregates.overall_statistics()
+        self._artifacts['industry_group_statistics'] = aggregates.industry_group_statistics()
 
-    def export_market_data(self):
-        overall_stats_file = 'Exports/Overall_Statistics.txt'
-        with open(overall_stats_file, 'w') as file:
-            for key, value in self.overall_statistics.items():
-                file.write(f"{key}: {value}\n")
+        fitted['rows_since_training'] += len(delta)
+        drift = abs(self.overall_statistics['median_last_funding'] - fitted['training_median']) / fitted['training_median']
+        retrain = fitted['rows_since_training'] >= retrain_row_fraction * fitted['training_rows'] or drift >= retrain_drift
+        if retrain:
+            self.retrain_warm_start()
+
+        return {
+            'inserted': int((~updated).sum()),
+            'updated': int(updated.sum()),
+            'retrained': retrain,
+            'rows_since_training': fitted['rows_since_training'] if not retrain else 0,
+            'drift': drift
+        }
+
+    @profiling.profiled('retrain_warm_start')
+    def retrain_warm_start(self, extra_trees: int = WARM_START_TREES):
+        #Grow the fitted model by extra_trees trees (or boosting iterations) trained on the current data, the existing ones and the scaler are kept
+        #The linear backend has nothing to grow and is refit. Cross-validation scores are those of the last full training
+        self.predictive_model
+        fitted = self._artifacts['fitted_model']
+        X = prediction_features(self.cleaned_df, self.industry_index.industry_counts())[fitted['feature_columns']]
+        y = self.cleaned_df['Last Funding Amount (in USD)']
+        X_scaled = fitted['scaler'].transform(X)
+
+        model = fitted['model']
+        model_backends.grow(model, self.model_backend, extra_trees)
+        model.fit(X_scaled, y)
+
+        predictions = model.predict(X_scaled)
+        self.cleaned_df['Expected Next Funding'] = predictions
+        self.cleaned_df['Funding Difference'] = self.cleaned_df['Expected Next Funding'] - self.cleaned_df['Last Funding Amount (in USD)']
+        self.invalidate('score_components')
+        fitted.update(predictions=predictions, cache_hit=False, training_rows=len(X), rows_since_training=0, training_median=float(y.median()))
+        self._artifacts['predictive_model'] = {
+            'cross_val_scores': fitted['cross_val_scores'],
+            'mean_cv_score': fitted['cross_val_scores'].mean(),
+            'feature_importance': model_backends.feature_importance(model, fitted['feature_columns'])
+        }
 
-        industry_stats_file = 'Exports/Industry_Group_Statistics.csv'
+    #Single exports written by exports.py, exports.export_all writes all of them in one pass
+    @profiling.profiled('export_market_data')
+    def export_market_data(self, file_format: str = 'csv', directory: str = exports.EXPORT_DIRECTORY):
+        exports.check_format(file_format)
+        os.makedirs(directory, exist_ok=True)
+        exports.write_overall_statistics(self.overall_statistics, os.path.join(directory, 'Overall_Statistics.txt'))
         industry_stats_df = pd.DataFrame(self.industry_group_statistics).T
-        industry_stats_df.to_csv(industry_stats_file, index=True)
+        exports.write_frame(industry_stats_df, os.path.join(directory, 'Industry_Group_Statistics'), file_format, 'Industry')
 
-    def export_top_companies(self, n: int, inv_weight: float, fund_weight: float, market_weight: float):
+    @profiling.profiled('export_top_companies')
+    def export_top_companies(self, n: int, inv_weight: float, fund_weight: float, market_weight: float,
+                             file_format: str = 'csv', directory: str = exports.EXPORT_DIRECTORY):
+        exports.check_format(file_format)
+        os.makedirs(directory, exist_ok=True)
         top_companies = self.best_companies(n, inv_weight, fund_weight, market_weight)
-        top_companies_file = 'Exports/Top_Companies.csv'
-        top_companies.to_csv(top_companies_file, index=False)
+        exports.write_frame(top_companies, os.path.join(directory, 'Top_Companies'), file_format)
 
 
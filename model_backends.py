@@ -0,0 +1,81 @@
+#This files purpose is to define the regression models Market can predict the next funding with
+#sklearn is only imported when a model is built, so loading data never pays for it
+
+import importlib
+
+DEFAULT_BACKEND = 'random_forest'
+
+#estimator: import path of the sklearn class, params: fixed hyperparameters (part of the model cache key)
+#parallel: the estimator takes n_jobs, warm_start: parameter that grows the model when it is refit with warm_start=True
+BACKENDS = {
+    'random_forest': {
+        'estimator': 'sklearn.ensemble.RandomForestRegressor',
+        'params': {'n_estimators': 100, 'random_state': 42},
+        'parallel': True,
+        'warm_start': 'n_estimators'
+    },
+    'hist_gradient_boosting': {
+        'estimator': 'sklearn.ensemble.HistGradientBoostingRegressor',
+        'params': {'random_state': 42},
+        'parallel': False, #Uses all cores through OpenMP on its own
+        'warm_start': 'max_iter'
+    },
+    'linear': {
+        'estimator': 'sklearn.linear_model.Ridge',
+        'params': {'alpha': 1.0},
+        'parallel': False,
+        'warm_start': None
+    }
+}
+
+def backend_spec(backend: str) -> dict:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend '{backend}', available: {sorted(BACKENDS)}")
+    return BACKENDS[backend]
+
+def cache_settings(backend: str) -> dict:
+    #Everything that changes the fitted model, n_jobs only changes how fast it is fitted
+    return {'backend': backend, **backend_spec(backend)['params']}
+
+def make_model(backend: str, n_jobs: int = None):
+    spec = backend_spec(backend)
+    module_name, class_name = spec['estimator'].rsplit('.', 1)
+    estimator = getattr(importlib.import_module(module_name), class_name)
+    params = dict(spec['params'])
+    if spec['parallel']:
+        params['n_jobs'] = n_jobs
+
+    if backend == 'linear':
+        #Ridge cannot handle missing features (e.g. an unknown founding date), the trees handle them natively
+        from sklearn.impute import SimpleImputer
+        from sklearn.pipeline import make_pipeline
+        return make_pipeline(SimpleImputer(strategy='median'), estimator(**params))
+    return estimator(**params)
+
+def cross_validation_model(model, backend: str):
+    #Cross-validation already runs the folds in parallel, so each fold's model is fitted on a single core
+    from sklearn.base import clone
+    model = clone(model)
+    if backend_spec(backend)['parallel']:
+        model.set_params(n_jobs=1)
+    return model
+
+def grow(model, backend: str, extra: int) -> bool:
+    #Prepare model to add extra trees or iterations on its next fit, False when the backend can only be refit from scratch
+    parameter = backend_spec(backend)['warm_start']
+    if parameter is None:
+        return False
+    model.set_params(warm_start=True, **{parameter: model.get_params()[parameter] + extra})
+    return True
+
+def feature_importance(model, feature_columns) -> dict:
+    #Impurity importances for forests, share of the absolute coefficients for the linear model, empty when the model has neither
+    if hasattr(model, 'steps'):
+        model = model.steps[-1][1]
+    if hasattr(model, 'feature_importances_'):
+        importances = model.feature_importances_
+    elif hasattr(model, 'coef_'):
+        importances = abs(model.coef_) / abs(model.coef_).sum()
+    else:
+        return {}
+    return dict(zip(feature_columns, importances))
@@ -0,0 +1,51 @@
+#This files purpose is to keep fitted predictive models on disk so the same input file is never trained twice
+
+import hashlib
+import json
+import os
+import utils
+
+CACHE_DIR = os.path.join('.cache', 'models')
+CACHE_VERSION = 1
+MAX_ENTRIES = 20
+
+def cache_key(file_hash: str, feature_columns: list, model_params: dict, cv_folds: int) -> str:
+    #Any change to the input file, the features or the hyperparameters produces a different key
+    settings = json.dumps({
+        'version': CACHE_VERSION,
+        'file_hash': file_hash,
+        'feature_columns': list(feature_columns),
+        'model_params': model_params,
+        'cv_folds': cv_folds
+    }, sort_keys=True)
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+def _entry_path(file_path: str, key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{utils.source_id(file_path)}-{key}.joblib")
+
+def exists(file_path: str, key: str) -> bool:
+    return os.path.exists(_entry_path(file_path, key))
+
+def load(file_path: str, key: str):
+    entry_path = _entry_path(file_path, key)
+    if not os.path.exists(entry_path):
+        return None
+    import joblib #Deferred, unpickling the entry loads sklearn anyway and checking for an entry needs neither
+    try:
+        entry = joblib.load(entry_path)
+        os.utime(entry_path) #Mark as recently used for eviction
+    except Exception:
+        #A corrupt or incompatible entry, or one evicted by another thread meanwhile, is treated like a miss
+        return None
+    return entry
+
+def save(file_path: str, key: str, entry: dict):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entry_path = _entry_path(file_path, key)
+    utils.evict_stale_entries(CACHE_DIR, file_path, entry_path, MAX_ENTRIES)
+
+    #Write to a temporary file first so an interrupted save never leaves a half written entry behind
+    import joblib
+    temporary_path = entry_path + '.tmp'
+    joblib.dump(entry, temporary_path)
+    os.replace(temporary_path, entry_path)
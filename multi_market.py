@@ -0,0 +1,112 @@
+#This files purpose is to load several Crunchbase exports at once and compare funding rounds
+#Files are validated, parsed and cleaned in parallel, then merged into one frame indexed by (round, company)
+#Every round keeps its own Market, so per-round statistics and models are computed concurrently with the existing code
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import market
+import industry_index
+
+INDEX_NAMES = ['Funding Round', 'Organization Name URL']
+
+class MultiMarket:
+    def __init__(self, file_paths, max_workers: int = None, **market_options):
+        #market_options are passed on to every Market (use_model_cache, use_data_cache, compact, ...)
+        if not file_paths:
+            raise ValueError('At least one file is needed')
+        self.file_paths = list(file_paths)
+        self.max_workers = max_workers
+
+        #Parsing and cleaning spend most of their time in pandas' C code, so threads load the files in parallel
+        file_markets = self._map(lambda path: self._load_file(path, market_options), self.file_paths)
+
+        #Files of the same round (e.g. regional exports) become a single Market for that round
+        self.markets = {}
+        for path, file_market in zip(self.file_paths, file_markets):
+            self.markets.setdefault(file_market.funding_round, []).append(file_market)
+        self.markets = {funding_round: self._combine(round_markets) for funding_round, round_markets in self.markets.items()}
+
+        self.companies = pd.concat(
+            {funding_round: self._rows(round_market).set_index('Organization Name URL') for funding_round, round_market in self.markets.items()},
+            names=INDEX_NAMES
+        ).sort_index()
+
+    @staticmethod
+    def _load_file(path: str, market_options: dict):
+        file_market = market.Market(path, **market_options)
+        file_market.cleaned_df #Parse and clean inside the worker thread
+        return file_market
+
+    @staticmethod
+    def _rows(round_market) -> pd.DataFrame:
+        #All rows in the regular layout, also for compact markets
+        return round_market.rows(np.arange(len(round_market.cleaned_df)))
+
+    @classmethod
+    def _combine(cls, round_markets: list):
+        if len(round_markets) == 1:
+            return round_markets[0]
+        #A company listed in several exports of the same round is kept once, as listed in the first file
+        combined = pd.concat([cls._rows(round_market) for round_market in round_markets], ignore_index=True)
+        round_market = round_markets[0]
+        round_market.cleaned_df = combined.drop_duplicates('Organization Name URL').reset_index(drop=True)
+        return round_market
+
+    def _map(self, function, items) -> list:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(function, items))
+
+    def _per_round(self, function) -> dict:
+        #Each round's Market is only used by one thread at a time
+        results = self._map(function, self.markets.values())
+        return dict(zip(self.markets, results))
+
+    def rounds(self) -> list:
+        return list(self.markets)
+
+    def overall_statistics(self) -> dict:
+        return self._per_round(lambda round_market: round_market.overall_statistics)
+
+    def industry_group_statistics(self) -> dict:
+        return self._per_round(lambda round_market: round_market.industry_group_statistics)
+
+    def train_predictive_models(self) -> dict:
+        return self._per_round(lambda round_market: round_market.predictive_model)
+
+    def _round(self, funding_round: str) -> pd.DataFrame:
+        if funding_round not in self.markets:
+            raise KeyError(f"No data for funding round '{funding_round}', loaded rounds: {self.rounds()}")
+        return self.companies.xs(funding_round, level='Funding Round')
+
+    def companies_in_rounds(self, *funding_rounds: str, columns=('Organization Name', 'Last Funding Amount (in USD)', 'Total Funding Amount (in USD)')) -> pd.DataFrame:
+        #Companies listed in every given round, as an inner join on the company URL with one column group per round
+        if len(funding_rounds) < 2:
+            raise ValueError('At least two funding rounds are needed')
+        frames = [self._round(funding_round)[list(columns)] for funding_round in funding_rounds]
+        return pd.concat(frames, axis=1, join='inner', keys=funding_rounds, names=['Funding Round', None])
+
+    def median_uplift_by_industry(self, from_round: str, to_round: str, column: str = 'Last Funding Amount (in USD)') -> pd.DataFrame:
+        #Median of column per industry in both rounds, joined on the industry name, plus the uplift from one round to the other
+        medians = []
+        for funding_round in (from_round, to_round):
+            companies = self._round(funding_round)
+            index = industry_index.IndustryIndex(companies['Industry Groups'])
+            aggregated = index.aggregate(companies[column])[['count', 'median']]
+            medians.append(aggregated.add_prefix(f'{funding_round} '))
+
+        joined = medians[0].join(medians[1], how='inner').sort_index()
+        joined.index.name = 'Industry'
+        joined['uplift'] = joined[f'{to_round} median'] / joined[f'{from_round} median']
+        return joined
+
+    def company_uplift_by_industry(self, from_round: str, to_round: str, column: str = 'Last Funding Amount (in USD)') -> pd.DataFrame:
+        #Same companies followed across rounds: median per-company ratio per industry (industries as listed in to_round)
+        both = self.companies_in_rounds(from_round, to_round, columns=(column, 'Industry Groups'))
+        if both.empty:
+            return pd.DataFrame(columns=['count', 'median_uplift']).rename_axis('Industry')
+        uplift = both[(to_round, column)].to_numpy(dtype=float) / both[(from_round, column)].to_numpy(dtype=float)
+        index = industry_index.IndustryIndex(both[(to_round, 'Industry Groups')])
+        aggregated = index.aggregate(uplift)[['count', 'median']].rename(columns={'median': 'median_uplift'})
+        aggregated.index.name = 'Industry'
+        return aggregated.sort_index()
@@ -0,0 +1,152 @@
+#This files purpose is to measure where the time and memory of a Market go, stage by stage
+#A Profiler passed to Market (or to the CLI with --profile) records wall time, CPU time and row counts of every stage
+#Peak memory is opt-in (track_memory=True): tracemalloc makes every stage several times slower, so timings of such a run are inflated
+#cProfile and tracemalloc snapshots can be captured around named stages to trace a regression to the functions inside a stage
+#Only the standard library is imported here, so profiling does not slow down the start of the CLI
+
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+
+TOP_ENTRIES = 20 #Functions or allocation sites kept per captured stage
+
+class StageRecord:
+    __slots__ = ('stage', 'parent', 'wall_seconds', 'cpu_seconds', 'peak_memory_bytes', 'rows', 'cprofile', 'allocations', '_peak_seen')
+
+    def __init__(self, stage: str, parent: str = None, rows: int = None):
+        self.stage = stage
+        self.parent = parent
+        self.rows = rows
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.peak_memory_bytes = None
+        self.cprofile = None
+        self.allocations = None
+        self._peak_seen = 0
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith('_') and getattr(self, name) is not None}
+
+class Profiler:
+    #cprofile_stages and snapshot_stages name the stages that also get a cProfile or tracemalloc capture, snapshots need track_memory
+    def __init__(self, track_memory: bool = False, cprofile_stages=(), snapshot_stages=()):
+        self.track_memory = track_memory
+        self.cprofile_stages = set(cprofile_stages)
+        self.snapshot_stages = set(snapshot_stages)
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local() #Stack of open stages per thread, so nested stages know their parent
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows: int = None):
+        #Yields the record, rows can also be set inside the block once they are known
+        stack = self._stack()
+        record = StageRecord(name, stack[-1].stage if stack else None, rows)
+
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            #Memory is traced process wide, the peak of an enclosing stage is kept before it is reset for this one
+            current, peak = tracemalloc.get_traced_memory()
+            for parent in stack:
+                parent._peak_seen = max(parent._peak_seen, peak)
+            tracemalloc.reset_peak()
+            start_memory = current
+
+        profile = None
+        if name in self.cprofile_stages:
+            profile = cProfile.Profile()
+            profile.enable()
+
+        stack.append(record)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - start_wall
+            record.cpu_seconds = time.process_time() - start_cpu
+            stack.pop()
+
+            if profile is not None:
+                profile.disable()
+                output = io.StringIO()
+                pstats.Stats(profile, stream=output).sort_stats('cumulative').print_stats(TOP_ENTRIES)
+                record.cprofile = output.getvalue()
+
+            if tracing and tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1], record._peak_seen)
+                record.peak_memory_bytes = max(peak - start_memory, 0)
+                for parent in stack:
+                    parent._peak_seen = max(parent._peak_seen, peak)
+                if name in self.snapshot_stages:
+                    statistics = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ENTRIES]
+                    record.allocations = [{'location': str(statistic.traceback), 'size_bytes': statistic.size, 'count': statistic.count} for statistic in statistics]
+
+            with self._lock:
+                self.records.append(record)
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def report(self) -> list:
+        #Every recorded stage in the order they finished, as plain dictionaries
+        with self._lock:
+            return [record.to_dict() for record in self.records]
+
+    def summary(self) -> dict:
+        #Per stage totals: calls, wall and CPU time, largest peak memory and rows
+        totals = {}
+        for record in self.report():
+            total = totals.setdefault(record['stage'], {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_memory_bytes': None, 'rows': None})
+            total['calls'] += 1
+            total['wall_seconds'] += record['wall_seconds']
+            total['cpu_seconds'] += record['cpu_seconds']
+            if 'peak_memory_bytes' in record:
+                total['peak_memory_bytes'] = max(total['peak_memory_bytes'] or 0, record['peak_memory_bytes'])
+            if 'rows' in record:
+                total['rows'] = record['rows']
+        return totals
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<28} {'calls':>5} {'wall (s)':>9} {'cpu (s)':>9} {'peak (MB)':>10} {'rows':>9}"]
+        for stage, total in self.summary().items():
+            peak = f"{total['peak_memory_bytes'] / 1e6:.1f}" if total['peak_memory_bytes'] is not None else '-'
+            rows = total['rows'] if total['rows'] is not None else '-'
+            lines.append(f"{stage:<28} {total['calls']:>5} {total['wall_seconds']:>9.3f} {total['cpu_seconds']:>9.3f} {peak:>10} {rows:>9}")
+        return '\n'.join(lines)
+
+    def save(self, path: str):
+        with open(path, 'w') as file:
+            json.dump({'summary': self.summary(), 'stages': self.report()}, file, indent=2)
+
+def stage(profiler, name: str, rows: int = None):
+    #Stage of an optional profiler, without one the block runs unmeasured
+    if profiler is None:
+        return contextlib.nullcontext(StageRecord(name))
+    return profiler.stage(name, rows)
+
+def profiled(name: str):
+    #Decorator for methods of objects with a profiler attribute (Market), the call becomes a stage named name
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with stage(self.profiler, name) as record:
+                result = method(self, *args, **kwargs)
+                if hasattr(result, 'shape'):
+                    record.rows = result.shape[0]
+            return result
+        return wrapper
+    return decorate
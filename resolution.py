@@ -0,0 +1,169 @@
+#This files purpose is to resolve the investor names used in company files to investors in the registry
+#Resolution runs once per load over the unique names, scoring then only needs a hash lookup per (company, investor) pair
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+import utils
+
+CACHE_DIR = os.path.join('.cache', 'aliases')
+RESOLVER_VERSION = 2
+MAX_ENTRIES = 20
+
+DEFAULT_MIN_CONFIDENCE = 95
+MIN_FUZZY_LENGTH = 6 #Short names differ by one letter between unrelated investors, so they only resolve exactly
+PART_CONFIDENCE = 99 #A match on one part of a name (e.g. an acronym in brackets) is less certain than one on the whole name
+
+TRANSLITERATION = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue', 'ß': 'ss', 'ø': 'o', 'Ø': 'O', 'æ': 'ae', 'Æ': 'Ae', '&': ' and '})
+LEGAL_SUFFIXES = {'gmbh', 'ag', 'ltd', 'limited', 'llc', 'llp', 'lp', 'inc', 'plc', 'sa', 'sas', 'sarl', 'srl', 'spa', 'bv', 'nv', 'ab', 'oy', 'as', 'se', 'co'}
+SINGULAR_FORMS = {'ventures': 'venture', 'partners': 'partner', 'investments': 'investment', 'investors': 'investor', 'funds': 'fund', 'holdings': 'holding'}
+#Words shared by many unrelated investors, left out when measuring how similar two names are
+GENERIC_WORDS = {'venture', 'capital', 'partner', 'investment', 'investor', 'fund', 'holding', 'group', 'management', 'equity', 'vc', 'the', 'and'}
+
+ALIAS_COLUMNS = ['Alias', 'Investor Position', 'Investor Name', 'Confidence', 'Method']
+
+def normalize_name(name: str) -> str:
+    #Transliterate and strip accents, lowercase, drop punctuation and legal suffixes, singularize common plurals
+    name = unicodedata.normalize('NFKD', name.translate(TRANSLITERATION)).encode('ascii', 'ignore').decode('ascii')
+    tokens = [SINGULAR_FORMS.get(token, token) for token in re.sub(r'[^0-9a-z]+', ' ', name.casefold()).split()]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+def is_generic(token: str) -> bool:
+    #Misspelled generic words ("Capitall") are still generic
+    if token in GENERIC_WORDS:
+        return True
+    from rapidfuzz import fuzz, process #Deferred, only fuzzy resolution needs rapidfuzz
+    return len(token) >= 5 and process.extractOne(token, GENERIC_WORDS, scorer=fuzz.ratio, score_cutoff=85) is not None
+
+def core_name(normalized: str) -> str:
+    core = ' '.join(token for token in normalized.split() if not is_generic(token))
+    return core or normalized
+
+def name_parts(name: str) -> list:
+    #"HTGF | High-Tech Gruenderfonds" and "Andreessen Horowitz (a16z)" are each known under every part of their name
+    return [part.strip() for part in re.split(r'\s*\|\s*|\s*\(|\)\s*', name) if part and part.strip()]
+
+def registry_variants(registry) -> pd.DataFrame:
+    #Normalized variant -> registry position and the part of the name it came from (None for the whole name)
+    #Earlier investors win when two share a variant
+    variants, positions, parts = [], [], []
+    for position in registry.name_positions:
+        name = registry.names[position]
+        for part in [None] + name_parts(name):
+            variants.append(normalize_name(name if part is None else part))
+            positions.append(position)
+            parts.append(part)
+    table = pd.DataFrame({'Investor Position': np.asarray(positions, dtype=np.int64), 'Part': parts}, index=variants)
+    return table[~table.index.duplicated() & (table.index != '')]
+
+def fuzzy_matches(aliases: pd.Series, variants: pd.Series, min_confidence: float) -> pd.DataFrame:
+    #Blocked many-to-many similarity: only names whose distinctive part starts with the same character are compared
+    #Confidence is the lower of the full name and distinctive part similarity, so shared words like "Ventures" cannot carry a match
+    from rapidfuzz import fuzz, process
+    alias_cores = aliases.map(core_name)
+    variant_cores = pd.Series(variants.index.map(core_name), index=variants.index)
+    alias_cores = alias_cores[alias_cores.str.len() >= MIN_FUZZY_LENGTH]
+    variant_cores = variant_cores[variant_cores.str.len() >= MIN_FUZZY_LENGTH]
+
+    matches = []
+    for block, block_cores in alias_cores.groupby(alias_cores.str[0]):
+        block_variant_cores = variant_cores[variant_cores.str[0] == block]
+        if block_variant_cores.empty:
+            continue
+        core_similarity = process.cdist(block_cores.to_numpy(), block_variant_cores.to_numpy(), scorer=fuzz.ratio,
+                                        score_cutoff=min_confidence, workers=-1)
+        name_similarity = process.cdist(aliases[block_cores.index].to_numpy(), block_variant_cores.index.to_numpy(), scorer=fuzz.ratio,
+                                        score_cutoff=min_confidence, workers=-1)
+        similarity = np.minimum(core_similarity, name_similarity)
+
+        best = similarity.argmax(axis=1)
+        confidence = similarity[np.arange(len(best)), best]
+        matched = confidence > 0
+        matches.append(pd.DataFrame({
+            'Alias': block_cores.index[matched],
+            'Investor Position': variants['Investor Position'].to_numpy()[variants.index.get_indexer(block_variant_cores.index[best[matched]])],
+            'Confidence': confidence[matched]
+        }))
+
+    if not matches:
+        return pd.DataFrame(columns=['Alias', 'Investor Position', 'Confidence'])
+    return pd.concat(matches, ignore_index=True)
+
+def resolve_aliases(names, registry, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> pd.DataFrame:
+    #Alias table for the unique investor names of a company file: exact, then normalized, then fuzzy matches
+    names = pd.Index(pd.unique(np.asarray(names, dtype=object)))
+    names = names[np.array([isinstance(name, str) for name in names], dtype=bool)]
+
+    exact = registry.positions(names)
+    table = pd.DataFrame({'Alias': names[exact >= 0], 'Investor Position': exact[exact >= 0], 'Confidence': 100.0, 'Method': 'exact'})
+
+    remaining = names[exact < 0]
+    normalized = pd.Series(remaining.map(normalize_name), index=remaining)
+    variants = registry_variants(registry)
+    found = variants.index.get_indexer(normalized.to_numpy())
+    matched = variants.iloc[np.maximum(found, 0)]
+    #A part of a name only counts when it is long enough to be distinctive or spelled exactly like the alias,
+    #otherwise "+ BAs" (business angels) would be credited to "Business Angels Switzerland (BAS)"
+    is_part = matched['Part'].notna().to_numpy()
+    distinctive = (normalized.str.len().to_numpy() >= MIN_FUZZY_LENGTH) | (remaining.str.strip() == matched['Part'].to_numpy())
+    resolved = (found >= 0) & (~is_part | (distinctive & (PART_CONFIDENCE >= min_confidence)))
+    normalized_matches = pd.DataFrame({'Alias': remaining[resolved], 'Investor Position': matched['Investor Position'].to_numpy()[resolved],
+                                       'Confidence': np.where(is_part[resolved], float(PART_CONFIDENCE), 100.0),
+                                       'Method': np.where(is_part[resolved], 'part', 'normalized')})
+
+    fuzzy = fuzzy_matches(normalized[~resolved], variants, min_confidence).assign(Method='fuzzy')
+
+    table = pd.concat([table, normalized_matches, fuzzy], ignore_index=True)
+    table['Investor Position'] = table['Investor Position'].astype(np.int64)
+    table['Investor Name'] = registry.names[table['Investor Position'].to_numpy()]
+    return table[ALIAS_COLUMNS]
+
+def cache_key(file_hash: str, registry, min_confidence: float) -> str:
+    settings = json.dumps({
+        'version': RESOLVER_VERSION,
+        'file_hash': file_hash,
+        'registry': registry.fingerprint(),
+        'min_confidence': min_confidence
+    }, sort_keys=True)
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+def _entry_path(file_path: str, key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{utils.source_id(file_path)}-{key}.csv")
+
+def load(file_path: str, key: str):
+    entry_path = _entry_path(file_path, key)
+    if not os.path.exists(entry_path):
+        return None
+    os.utime(entry_path) #Mark as recently used for eviction
+    return pd.read_csv(entry_path, dtype={'Alias': str, 'Investor Name': str, 'Method': str}, keep_default_na=False)
+
+def save(file_path: str, key: str, table: pd.DataFrame):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entry_path = _entry_path(file_path, key)
+    utils.evict_stale_entries(CACHE_DIR, file_path, entry_path, MAX_ENTRIES)
+
+    temporary_path = entry_path + '.tmp'
+    table.to_csv(temporary_path, index=False)
+    os.replace(temporary_path, entry_path)
+
+class AliasIndex:
+    #Hash index from the alias strings of a company file to registry positions
+    def __init__(self, table: pd.DataFrame):
+        self.table = table
+        self.aliases = pd.Index(table['Alias'].to_numpy(dtype=object))
+        self.investor_positions = table['Investor Position'].to_numpy(dtype=np.int64)
+
+    def positions(self, names) -> np.ndarray:
+        found = self.aliases.get_indexer(np.asarray(names, dtype=object))
+        return np.where(found >= 0, self.investor_positions[found], -1)
+
+    def extend(self, table: pd.DataFrame) -> 'AliasIndex':
+        #A new index that also knows the aliases of table, earlier entries win for an alias listed twice
+        combined = pd.concat([self.table, table], ignore_index=True)
+        return AliasIndex(combined[~combined['Alias'].duplicated()].reset_index(drop=True))
@@ -0,0 +1,106 @@
+#This files purpose is to describe the Crunchbase export layout this application expects and to validate files against it
+#Validation only reads the header and the funding type column, so malformed files are rejected before the full parse
+
+import csv
+import itertools
+import pandas as pd
+
+#Bumped whenever the layout or the way it is cleaned changes, so derived caches are not reused across layouts
+SCHEMA_VERSION = 1
+
+#Column name -> kind, in the exact order of a Crunchbase company export
+COLUMNS = {
+    'Organization Name': 'string',
+    'Organization Name URL': 'string',
+    'Growth Category': 'string',
+    'Postal Code': 'string',
+    'Full Description': 'string',
+    'Actively Hiring': 'string',
+    'Industries': 'string',
+    'Headquarters Location': 'string',
+    'Description': 'string',
+    'CB Rank (Company)': 'string',
+    'Founded Date': 'date',
+    'Founded Date Precision': 'string',
+    'Number of Investments': 'number',
+    'Founders': 'string',
+    'IPO Status': 'string',
+    'CB Rank (Organization)': 'string',
+    'CB Rank (School)': 'number',
+    'Last Funding Date': 'date',
+    'Number of Funding Rounds': 'number',
+    'Funding Status': 'string',
+    'Last Funding Amount': 'number',
+    'Last Funding Amount Currency': 'string',
+    'Last Funding Amount (in USD)': 'number',
+    'Last Funding Type': 'string',
+    'Total Funding Amount': 'number',
+    'Total Funding Amount Currency': 'string',
+    'Total Funding Amount (in USD)': 'number',
+    'Last Equity Funding Amount': 'number',
+    'Last Equity Funding Amount Currency': 'string',
+    'Last Equity Funding Amount (in USD)': 'number',
+    'Last Equity Funding Type': 'string',
+    'Total Equity Funding Amount': 'number',
+    'Total Equity Funding Amount Currency': 'string',
+    'Total Equity Funding Amount (in USD)': 'number',
+    'Top 5 Investors': 'string',
+    'Number of Investors': 'number',
+    'Industry Groups': 'string',
+    'Investment Stage': 'string',
+    'Headquarters Regions': 'string',
+    'Website': 'string',
+    'LinkedIn': 'string',
+    'Contact Email': 'string',
+    'Number of Employees': 'string'
+}
+
+FUNDING_TYPES = {
+    'Pre-Seed', 'Seed', 'Angel',
+    'Series A', 'Series B', 'Series C', 'Series D', 'Series E', 'Series F', 'Series G', 'Series H', 'Series I', 'Series J',
+    'Venture - Series Unknown', 'Corporate Round', 'Private Equity', 'Convertible Note', 'Debt Financing',
+    'Equity Crowdfunding', 'Product Crowdfunding', 'Grant', 'Non-equity Assistance', 'Initial Coin Offering',
+    'Secondary Market', 'Post-IPO Equity', 'Post-IPO Debt', 'Post-IPO Secondary', 'Funding Round', 'Undisclosed'
+}
+
+FUNDING_TYPE_CHUNKSIZE = 5_000
+
+def read_dtypes() -> dict:
+    #Text and date columns are read as strings, numbers are left to pandas so missing values become NaN
+    return {column: str for column, kind in COLUMNS.items() if kind != 'number'}
+
+def validate_header(file_path: str):
+    with open(file_path, newline='', encoding='utf-8-sig') as file:
+        header = next(csv.reader(file), [])
+
+    if header != list(COLUMNS):
+        missing = [column for column in COLUMNS if column not in header]
+        unexpected = [column for column in header if column not in COLUMNS]
+        details = f" (missing: {missing}, unexpected: {unexpected})" if missing or unexpected else " (columns are out of order)"
+        raise ValueError('File is not valid, the column layout is not compatible with this application' + details)
+
+def validate_funding_type(file_path: str, max_chunks: int = None) -> str:
+    #Stream only the funding type column and stop at the first chunk that breaks the rules
+    #With max_chunks only the start of the file is checked, a cheap early rejection before the full check
+    funding_types = set()
+    chunks = pd.read_csv(file_path, usecols=['Last Funding Type'], dtype=str, chunksize=FUNDING_TYPE_CHUNKSIZE)
+    for chunk in itertools.islice(chunks, max_chunks):
+        values = chunk['Last Funding Type']
+        if values.isna().any():
+            raise ValueError('File is not valid, some companies have no Last Funding Type')
+
+        funding_types.update(values.unique())
+        unknown = funding_types - FUNDING_TYPES
+        if unknown:
+            raise ValueError(f'File is not valid, unknown funding types: {sorted(unknown)}')
+        if len(funding_types) > 1:
+            raise ValueError('File is not valid, there is a mix of different funding rounds')
+
+    if not funding_types:
+        raise ValueError('File is not valid, it does not contain any companies')
+    return funding_types.pop()
+
+def validate_file(file_path: str) -> str:
+    #Returns the funding round shared by every company in the file (e.g. Series A)
+    validate_header(file_path)
+    return validate_funding_type(file_path)
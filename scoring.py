@@ -0,0 +1,84 @@
+#This files purpose is to compute the company scores used to rank the best companies
+#All scores are computed as whole-column array operations so they never write back into the market data
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+import compact
+
+SCORE_COLUMNS = ['Investor Score Sum', 'Funding Difference', 'Market Context Score']
+
+def investor_score_sum(investor_lists, registry, aliases=None) -> np.ndarray:
+    # One entry per (company, investor) pair, works on a Series of lists and on a compact ListColumn
+    row_ids, names = compact.flatten_lists(investor_lists)
+    # Resolved aliases map spelling variants to registry positions, otherwise only exact names are credited
+    positions = (aliases or registry).positions(names)
+
+    # Unknown investors (-1) pick up the trailing 0, known investors with a missing score stay NaN
+    scores = np.append(registry.scores, 0.0)
+    return np.bincount(row_ids, weights=scores[positions], minlength=len(investor_lists))
+
+def market_context_score(companies: pd.DataFrame, overall_statistics: dict) -> np.ndarray:
+    total_funding_score = companies['Total Funding Amount (in USD)'].to_numpy(dtype=float) / overall_statistics['median_total_funding']
+    last_funding_score = companies['Last Funding Amount (in USD)'].to_numpy(dtype=float) / overall_statistics['median_last_funding']
+    return (total_funding_score + last_funding_score) / 2
+
+def normalize(values: np.ndarray) -> np.ndarray:
+    # Scale by the column maximum, ignoring missing values like pandas' max()
+    return values / np.nanmax(values)
+
+def score_components(companies: pd.DataFrame, investor_score_sums: np.ndarray, overall_statistics: dict) -> pd.DataFrame:
+    # investor_score_sums are the raw per company sums of investor_score_sum, kept by Market so a delta only rescores its own rows
+    return pd.DataFrame({
+        'Investor Score Sum': normalize(investor_score_sums),
+        'Funding Difference': normalize(companies['Funding Difference'].to_numpy(dtype=float)),
+        'Market Context Score': market_context_score(companies, overall_statistics)
+    })
+
+def overall_score(components: pd.DataFrame, inv_weight: float, fund_weight: float, market_weight: float) -> pd.Series:
+    return (components['Investor Score Sum'] * inv_weight) + (components['Funding Difference'] * fund_weight) + (components['Market Context Score'] * market_weight)
+
+def top_n_positions(scores: np.ndarray, n: int) -> np.ndarray:
+    # Partial selection of the n best rows per column, only the selected rows get sorted
+    # Missing scores rank last, like sort_values(ascending=False)
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    n = min(n, scores.shape[0])
+    if n < scores.shape[0]:
+        candidates = np.argpartition(-scores, n - 1, axis=0)[:n]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[0])[:, None], scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=0)
+    order = np.argsort(-candidate_scores, axis=0, kind='stable')
+    return np.take_along_axis(candidates, order, axis=0)
+
+def sweep_weights(weights, n: int) -> np.ndarray:
+    # Checks the arguments of a weight sweep, a single triple becomes a one row matrix
+    if isinstance(n, bool) or not isinstance(n, (int, np.integer)) or n < 1:
+        raise ValueError(f'n must be a positive number of companies, got {n!r}')
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    if weights.ndim != 2 or weights.shape[0] == 0 or weights.shape[1] != len(SCORE_COLUMNS):
+        raise ValueError('Weights must be given as rows of (inv_weight, fund_weight, market_weight)')
+    return weights
+
+def weight_sweep(components: pd.DataFrame, weights: np.ndarray, n: int):
+    # Score every weight triple with a single (companies x 3) @ (3 x configurations) product
+    weights = sweep_weights(weights, n)
+    scores = components[SCORE_COLUMNS].to_numpy(dtype=float) @ weights.T
+    top = top_n_positions(scores, n)
+    return top, np.take_along_axis(scores, top, axis=0)
+
+def rank_overlap(top: np.ndarray, company_count: int) -> dict:
+    # Sparse indicator matrix (configurations x companies) of who made each top-n, pairwise intersections via one product
+    if top.ndim != 2 or top.shape[0] == 0:
+        raise ValueError('rank_overlap needs a (n x configurations) matrix of top positions with n >= 1')
+    configurations = top.shape[1]
+    membership = sparse.csr_matrix(
+        (np.ones(top.size, dtype=np.int32), (np.repeat(np.arange(configurations), top.shape[0]), top.T.ravel())),
+        shape=(configurations, company_count)
+    )
+    shared = (membership @ membership.T).toarray()
+    union = top.shape[0] * 2 - shared
+    return {
+        'overlap': shared / top.shape[0],
+        'jaccard': shared / union
+    }
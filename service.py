@@ -0,0 +1,256 @@
+#This files purpose is a long-lived local HTTP/JSON service that keeps Market instances loaded between queries
+#Run from the repository root: python service.py [--port 8765] [--dataset name=path ...]
+#Endpoints (GET, JSON responses):
+#  /datasets
+#  /stats/overall?dataset=seed
+#  /stats/industry?dataset=seed
+#  /investors/top?k=20&region=EU
+#  /companies/best?dataset=seed&n=10&inv_weight=1&fund_weight=0.5&market_weight=0.3
+
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_DATASETS = {
+    'seed': 'InputData/Seed_Europe_min2mio_companies-25-11-2024.csv',
+    'series_a': 'InputData/seriesA_Europe_companies-25-11-2024.csv'
+}
+MAX_REQUEST_LINE = 8192
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+class NotFoundError(Exception):
+    pass
+
+class ResultCache:
+    #Least recently used cache of finished query results, keyed by dataset and query parameters
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, count: bool = True):
+        if key not in self.entries:
+            self.misses += count
+            return None
+        self.hits += count
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+def frame_records(df) -> list:
+    #pandas writes NaN as null, dates as ISO strings and list cells as JSON arrays
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+def number_param(params: dict, name: str, kind, default=None, minimum=None):
+    if name not in params:
+        if default is None:
+            raise ValueError(f"Missing query parameter '{name}'")
+        return default
+    try:
+        value = kind(params[name])
+    except ValueError:
+        raise ValueError(f"Query parameter '{name}' must be {'an integer' if kind is int else 'a number'}") from None
+    if minimum is not None and value < minimum:
+        raise ValueError(f"Query parameter '{name}' must be at least {minimum}, got {value}")
+    return value
+
+class MarketService:
+    #CPU heavy work (loading, training, ranking) runs in a thread pool so the event loop keeps accepting requests
+    #Each dataset has its own lock: one Market is never computed on by two threads, different datasets run in parallel
+    def __init__(self, datasets: dict, cache_size: int = DEFAULT_CACHE_SIZE, workers: int = None, compact: bool = False):
+        self.datasets = dict(datasets)
+        self.compact = compact
+        self.cache = ResultCache(cache_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='market-service')
+        self.markets = {}
+        self.locks = {name: asyncio.Lock() for name in [*self.datasets, None]} #None guards the investor registry
+
+    async def run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def _load_market(self, name: str):
+        import market
+        return market.Market(self.datasets[name], compact=self.compact)
+
+    async def market(self, name: str):
+        #Called with the dataset lock held
+        if name not in self.markets:
+            self.markets[name] = await self.run(self._load_market, name)
+        return self.markets[name]
+
+    async def cached(self, dataset, key: tuple, compute):
+        #Identical queries wait for the first one under the dataset lock and then find its result in the cache
+        #Only the query that computed the result counts as a miss, the ones that waited for it count as hits
+        result = self.cache.get((dataset, *key), count=False)
+        if result is None:
+            async with self.locks[dataset]:
+                result = self.cache.get((dataset, *key), count=False)
+                if result is None:
+                    self.cache.misses += 1
+                    result = await compute()
+                    self.cache.put((dataset, *key), result)
+                    return result
+        self.cache.hits += 1
+        return result
+
+    def _dataset(self, params: dict) -> str:
+        name = params.get('dataset')
+        if name is None:
+            raise ValueError("Missing query parameter 'dataset'")
+        if name not in self.datasets:
+            raise NotFoundError(f"Unknown dataset '{name}', available: {sorted(self.datasets)}")
+        return name
+
+    async def overall_statistics(self, params: dict):
+        name = self._dataset(params)
+        async def compute():
+            market_instance = await self.market(name)
+            return await self.run(lambda: market_instance.overall_statistics)
+        return await self.cached(name, ('overall',), compute)
+
+    async def industry_statistics(self, params: dict):
+        name = self._dataset(params)
+        async def compute():
+            market_instance = await self.market(name)
+            return await self.run(lambda: market_instance.industry_group_statistics)
+        return await self.cached(name, ('industry',), compute)
+
+    async def top_investors(self, params: dict):
+        k = number_param(params, 'k', int, 20, minimum=1)
+        region = params.get('region')
+        def compute_top():
+            import investor
+            registry = investor.get_registry()
+            if region is not None and region not in registry.regions:
+                raise ValueError(f"Unknown region '{region}', available: {list(registry.regions)}")
+            return frame_records(registry.to_frame(registry.top_k(k, region)))
+        async def compute():
+            return await self.run(compute_top)
+        return await self.cached(None, ('investors', k, region), compute)
+
+    async def best_companies(self, params: dict):
+        name = self._dataset(params)
+        n = number_param(params, 'n', int, minimum=1)
+        weights = tuple(number_param(params, weight, float) for weight in ('inv_weight', 'fund_weight', 'market_weight'))
+        async def compute():
+            market_instance = await self.market(name)
+            return await self.run(lambda: frame_records(market_instance.best_companies(n, *weights)))
+        return await self.cached(name, ('best', n, weights), compute)
+
+    async def list_datasets(self, params: dict):
+        return {
+            'datasets': {name: {'path': path, 'loaded': name in self.markets} for name, path in self.datasets.items()},
+            'cache': {'entries': len(self.cache.entries), 'hits': self.cache.hits, 'misses': self.cache.misses}
+        }
+
+    def routes(self) -> dict:
+        return {
+            '/datasets': self.list_datasets,
+            '/stats/overall': self.overall_statistics,
+            '/stats/industry': self.industry_statistics,
+            '/investors/top': self.top_investors,
+            '/companies/best': self.best_companies
+        }
+
+    async def preload(self):
+        for name in self.datasets:
+            async with self.locks[name]:
+                await self.market(name)
+
+    async def handle(self, method: str, target: str):
+        #Returns (status, JSON serializable body)
+        if method != 'GET':
+            return 405, {'error': 'Only GET is supported'}
+        url = urlsplit(target)
+        route = self.routes().get(url.path.rstrip('/') or '/')
+        if route is None:
+            return 404, {'error': f"Unknown path '{url.path}', available: {sorted(self.routes())}"}
+        try:
+            return 200, await route(dict(parse_qsl(url.query)))
+        except NotFoundError as error:
+            return 404, {'error': str(error)}
+        except (ValueError, KeyError) as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            return 500, {'error': f'{type(error).__name__}: {error}'}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        #Minimal HTTP/1.1: one request per connection, headers are read and ignored
+        try:
+            request_line = await reader.readline()
+            if len(request_line) > MAX_REQUEST_LINE:
+                status, body = 400, {'error': 'Request line too long'}
+            else:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    status, body = 400, {'error': 'Malformed request line'}
+                else:
+                    status, body = await self.handle(parts[0], parts[1])
+
+            payload = json.dumps(body).encode('utf-8')
+            writer.write(f'HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n'.encode('latin-1'))
+            writer.write(f'Content-Type: application/json\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n'.encode('latin-1'))
+            writer.write(payload)
+            await writer.drain()
+        except ConnectionError:
+            pass #The client went away, nothing left to answer
+        finally:
+            writer.close()
+
+async def serve(service: MarketService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, preload: bool = False):
+    if preload:
+        await service.preload()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Serving {sorted(service.datasets)} on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def parse_datasets(values) -> dict:
+    datasets = {}
+    for value in values:
+        name, separator, path = value.partition('=')
+        if not separator or not name or not path:
+            raise argparse.ArgumentTypeError(f"Datasets are given as name=path, got '{value}'")
+        datasets[name] = path
+    return datasets
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve market statistics and company rankings as JSON over HTTP.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--dataset', action='append', default=[], metavar='NAME=PATH', help='Dataset to serve, repeatable (default: the bundled Seed and Series A files)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help='Number of query results kept in the LRU cache')
+    parser.add_argument('--workers', type=int, default=None, help='Threads for loading, training and ranking')
+    parser.add_argument('--compact', action='store_true', help='Keep the company data in the memory-compact layout')
+    parser.add_argument('--preload', action='store_true', help='Load every dataset before accepting requests')
+    args = parser.parse_args(argv)
+
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    async def run():
+        #The service creates its locks inside the running event loop
+        service = MarketService(parse_datasets(args.dataset) or DEFAULT_DATASETS, args.cache_size, args.workers, args.compact)
+        await serve(service, args.host, args.port, args.preload)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
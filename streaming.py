@@ -0,0 +1,173 @@
+#This files purpose is to load very large exports in chunks and compute the market statistics incrementally
+#Means and counts are exact, medians come from mergeable quantile sketches, so memory stays bounded by the chunk size
+
+import math
+import numpy as np
+import pandas as pd
+import schema
+import industry_index
+import utils
+
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+class QuantileSketch:
+    #Log-bucket sketch: every estimate is within relative_accuracy of a true value of that rank, and two sketches merge by adding counts
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative_accuracy must be between 0 and 1')
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _add_buckets(self, store: dict, values: np.ndarray):
+        buckets, counts = np.unique(np.ceil(np.log(values) / self.log_gamma).astype(np.int64), return_counts=True)
+        for bucket, count in zip(buckets.tolist(), counts.tolist()):
+            store[bucket] = store.get(bucket, 0) + count
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self._add_buckets(self.positive, values[values > 0])
+        self._add_buckets(self.negative, -values[values < 0])
+        self.zero_count += int((values == 0).sum())
+        self.count += len(values)
+
+    def merge(self, other: 'QuantileSketch'):
+        if other.gamma != self.gamma:
+            raise ValueError('Only sketches with the same relative accuracy can be merged')
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for bucket, count in other_store.items():
+                store[bucket] = store.get(bucket, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _bucket_value(self, bucket: int) -> float:
+        return 2 * self.gamma ** bucket / (self.gamma + 1)
+
+    def _value_at_rank(self, rank: int) -> float:
+        #Walk the buckets in value order: negatives (largest magnitude first), zeros, then positives
+        for bucket in sorted(self.negative, reverse=True):
+            rank -= self.negative[bucket]
+            if rank < 0:
+                return -self._bucket_value(bucket)
+        rank -= self.zero_count
+        if rank < 0:
+            return 0.0
+        for bucket in sorted(self.positive):
+            rank -= self.positive[bucket]
+            if rank < 0:
+                return self._bucket_value(bucket)
+        raise IndexError('rank out of range')
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return float('nan')
+        #Same interpolation as pandas for the median: average the two middle ranks when the count is even
+        position = q * (self.count - 1)
+        lower, upper = math.floor(position), math.ceil(position)
+        return (self._value_at_rank(lower) + self._value_at_rank(upper)) / 2
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+class RunningStatistic:
+    #Exact count and mean plus a sketch for the median of one numeric column
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.count = 0
+        self.total = 0.0
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.sketch.update(values)
+
+    def merge(self, other: 'RunningStatistic'):
+        self.count += other.count
+        self.total += other.total
+        self.sketch.merge(other.sketch)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else float('nan')
+
+    def median(self) -> float:
+        return self.sketch.median()
+
+class MarketAggregates:
+    #Incremental version of Market.get_overall_statistics and Market.get_industry_group_statistics
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.total_funding = RunningStatistic(relative_accuracy)
+        self.last_funding = RunningStatistic(relative_accuracy)
+        self.industries = {}
+
+    def update(self, cleaned_chunk: pd.DataFrame):
+        self.total_funding.update(cleaned_chunk['Total Funding Amount (in USD)'])
+        self.last_funding.update(cleaned_chunk['Last Funding Amount (in USD)'])
+
+        #The chunk's company x industry matrix gives the rows of every industry without exploding the chunk
+        chunk_index = industry_index.IndustryIndex(cleaned_chunk['Industry Groups'])
+        total_values = cleaned_chunk['Total Funding Amount (in USD)'].to_numpy(dtype=float)
+        last_values = cleaned_chunk['Last Funding Amount (in USD)'].to_numpy(dtype=float)
+        for industry in chunk_index.industries():
+            if industry not in self.industries:
+                self.industries[industry] = (RunningStatistic(self.relative_accuracy), RunningStatistic(self.relative_accuracy))
+            total_funding, last_funding = self.industries[industry]
+            rows = chunk_index.company_positions(industry)
+            total_funding.update(total_values[rows])
+            last_funding.update(last_values[rows])
+
+    def merge(self, other: 'MarketAggregates'):
+        self.total_funding.merge(other.total_funding)
+        self.last_funding.merge(other.last_funding)
+        for industry, (total_funding, last_funding) in other.industries.items():
+            if industry not in self.industries:
+                self.industries[industry] = (RunningStatistic(self.relative_accuracy), RunningStatistic(self.relative_accuracy))
+            self.industries[industry][0].merge(total_funding)
+            self.industries[industry][1].merge(last_funding)
+
+    def overall_statistics(self) -> dict:
+        return {
+            'mean_total_funding': int(self.total_funding.mean()),
+            'median_total_funding': int(self.total_funding.median()),
+            'mean_last_funding': int(self.last_funding.mean()),
+            'median_last_funding': int(self.last_funding.median())
+        }
+
+    def industry_group_statistics(self) -> dict:
+        simplified_stats = {}
+        for industry in sorted(self.industries):
+            total_funding, last_funding = self.industries[industry]
+            simplified_stats[industry] = {
+                'total_funding_mean': int(round(total_funding.mean())),
+                'total_funding_median': int(round(total_funding.median())),
+                'company_count': total_funding.count,
+                'last_funding_mean': int(round(last_funding.mean())),
+                'last_funding_median': int(round(last_funding.median()))
+            }
+        return simplified_stats
+
+def read_cleaned_chunks(file_path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    #Only the columns kept by utils.clean_data are parsed, the rest of every row is skipped by the CSV reader
+    dtypes = {column: dtype for column, dtype in schema.read_dtypes().items() if column in utils.COLUMNS_TO_KEEP}
+    for chunk in pd.read_csv(file_path, usecols=utils.COLUMNS_TO_KEEP, dtype=dtypes, chunksize=chunksize):
+        yield utils.clean_data(chunk)
+
+def stream_file(file_path: str, chunksize: int = DEFAULT_CHUNKSIZE, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, keep_rows: bool = False):
+    #Returns the aggregates of the whole file, plus the cleaned rows when keep_rows is set
+    aggregates = MarketAggregates(relative_accuracy)
+    kept_chunks = []
+    for cleaned_chunk in read_cleaned_chunks(file_path, chunksize):
+        aggregates.update(cleaned_chunk)
+        if keep_rows:
+            kept_chunks.append(cleaned_chunk)
+
+    cleaned_df = pd.concat(kept_chunks, ignore_index=True) if kept_chunks else None
+    return aggregates, cleaned_df
@@ -0,0 +1,324 @@
+#This files purpose is to generate synthetic Crunchbase exports of any size for benchmarks and load tests
+#The files have the exact layout of schema.COLUMNS and pass file validation, so every part of the application can run on them
+#Distributions (funding amounts, rounds, dates, currencies, industries, investors) are calibrated on the bundled Europe exports
+#Generation is deterministic: the same rows, round, seed and chunk size always give the same file
+#Run from the repository root: python synthetic.py OUTPUT_DIR --rows 1000000 --round "Series A" [--seed 42]
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import schema
+
+REFERENCE_DATE = pd.Timestamp('2024-11-25') #Export date, every last funding happened in the year before
+CHUNK_ROWS = 100_000 #Rows generated and written at once, bounds the memory of a large file
+DEFAULT_INVESTORS = 5_000
+UNLISTED_INVESTOR_SHARE = 0.05 #Share of top investors (mostly angels) that are not in the investor files
+
+#Per round: log-normal last funding amount in USD (mean and sigma of the log), mean number of earlier rounds,
+#mean company age in years at the last funding and the employee count buckets with their probabilities
+ROUND_PROFILES = {
+    'Pre-Seed': {'log_amount': (13.3, 0.8), 'earlier_rounds': 0.4, 'age': 1.5, 'status': 'Seed',
+                 'employees': {'1-10': 0.75, '11-50': 0.25}},
+    'Seed': {'log_amount': (15.27, 0.59), 'earlier_rounds': 1.2, 'age': 2.5, 'status': 'Seed',
+             'employees': {'1-10': 0.43, '11-50': 0.54, '51-100': 0.02, '101-250': 0.01}},
+    'Series A': {'log_amount': (16.25, 0.79), 'earlier_rounds': 2.1, 'age': 4.5, 'status': 'Early Stage Venture',
+                 'employees': {'1-10': 0.18, '11-50': 0.63, '51-100': 0.14, '101-250': 0.05}},
+    'Series B': {'log_amount': (17.2, 0.75), 'earlier_rounds': 3.2, 'age': 6.5, 'status': 'Late Stage Venture',
+                 'employees': {'11-50': 0.3, '51-100': 0.4, '101-250': 0.25, '251-500': 0.05}},
+    'Series C': {'log_amount': (17.9, 0.75), 'earlier_rounds': 4.3, 'age': 8.5, 'status': 'Late Stage Venture',
+                 'employees': {'51-100': 0.25, '101-250': 0.45, '251-500': 0.25, '501-1000': 0.05}}
+}
+
+#Currency -> (probability, USD per unit)
+CURRENCIES = {'EUR': (0.53, 1.05), 'USD': (0.28, 1.0), 'GBP': (0.16, 1.26), 'CHF': (0.02, 1.13), 'DKK': (0.01, 0.14)}
+
+#Most common industry groups first, a company's groups are drawn with Zipf weights over this order
+INDUSTRY_GROUPS = [
+    'Software', 'Science and Engineering', 'Data and Analytics', 'Information Technology', 'Artificial Intelligence (AI)',
+    'Health Care', 'Financial Services', 'Hardware', 'Sustainability', 'Internet Services', 'Other', 'Biotechnology',
+    'Professional Services', 'Energy', 'Manufacturing', 'Blockchain and Cryptocurrency', 'Transportation',
+    'Commerce and Shopping', 'Payments', 'Media and Entertainment', 'Real Estate', 'Food and Beverage', 'Gaming', 'Apps',
+    'Administrative Services', 'Design', 'Mobile', 'Education', 'Lending and Investments', 'Privacy and Security',
+    'Sales and Marketing', 'Consumer Electronics', 'Sports', 'Agriculture and Farming', 'Natural Resources',
+    'Music and Audio', 'Travel and Tourism', 'Consumer Goods', 'Video', 'Community and Lifestyle', 'Clothing and Apparel',
+    'Content and Publishing', 'Navigation and Mapping', 'Advertising', 'Messaging and Telecommunications', 'Events',
+    'Government and Military', 'Platforms', 'Social Impact'
+]
+INDUSTRY_COUNTS = {1: 0.15, 2: 0.21, 3: 0.23, 4: 0.15, 5: 0.12, 6: 0.09, 7: 0.04, 8: 0.01}
+INVESTOR_COUNTS = {1: 0.09, 2: 0.09, 3: 0.1, 4: 0.12, 5: 0.6}
+
+#City -> (probability, postal code prefix, Headquarters Regions)
+CITIES = {
+    'London, England, United Kingdom': (0.3, 'EC', 'Europe, Middle East, and Africa (EMEA)'),
+    'Paris, Ile-de-France, France': (0.15, '750', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Berlin, Berlin, Germany': (0.11, '10', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Munich, Bayern, Germany': (0.05, '80', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Amsterdam, Noord-Holland, The Netherlands': (0.05, '10', 'European Union (EU), Benelux, Europe, Middle East, and Africa (EMEA)'),
+    'Cambridge, Cambridgeshire, United Kingdom': (0.04, 'CB', 'Europe, Middle East, and Africa (EMEA)'),
+    'Copenhagen, Hovedstaden, Denmark': (0.04, '1', 'European Union (EU), Nordic Countries, Scandinavia'),
+    'Stockholm, Stockholms Lan, Sweden': (0.04, '11', 'European Union (EU), Nordic Countries, Scandinavia'),
+    'Helsinki, Southern Finland, Finland': (0.03, '00', 'European Union (EU), Nordic Countries, Scandinavia'),
+    'Zürich, Zurich, Switzerland': (0.03, '80', 'Europe, Middle East, and Africa (EMEA)'),
+    'Madrid, Madrid, Spain': (0.03, '280', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Barcelona, Catalonia, Spain': (0.03, '080', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Dublin, Dublin, Ireland': (0.03, 'D0', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Milan, Lombardia, Italy': (0.03, '201', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Lisbon, Lisboa, Portugal': (0.02, '1', 'European Union (EU), Europe, Middle East, and Africa (EMEA)'),
+    'Oslo, Oslo, Norway': (0.02, '0', 'Nordic Countries, Scandinavia, Europe, Middle East, and Africa (EMEA)')
+}
+
+NAME_PARTS = ['Nova', 'Flux', 'Quant', 'Verd', 'Lumi', 'Aero', 'Bio', 'Cyber', 'Data', 'Elec', 'Fin', 'Geo', 'Helio', 'Infra',
+              'Kine', 'Medi', 'Neur', 'Opti', 'Pay', 'Robo', 'Sense', 'Terra', 'Vita', 'Wave', 'Zen', 'Astra', 'Cell', 'Grid',
+              'Hydro', 'Loop']
+NAME_ENDINGS = ['ly', 'io', 'ix', 'ora', 'ex', 'on', 'us', 'ia', 'wise', 'hub', 'mind', 'stack', 'base', 'flow', 'path',
+                'labs', 'gen', 'core', 'cloud', 'works']
+FIRST_NAMES = ['Anna', 'Lukas', 'Sofia', 'Jonas', 'Emma', 'Mateo', 'Clara', 'Felix', 'Lea', 'Oscar', 'Marie', 'Elias', 'Nora',
+               'Hugo', 'Ida', 'Louis', 'Alba', 'Noah', 'Freya', 'Leon', 'Maja', 'Paul', 'Chloe', 'Henrik', 'Ines', 'Tomas',
+               'Julia', 'Arthur', 'Elin', 'David']
+LAST_NAMES = ['Muller', 'Garcia', 'Jensen', 'Rossi', 'Dubois', 'Smith', 'Nowak', 'Schmidt', 'Lindqvist', 'Moreau', 'Fischer',
+              'Silva', 'Bianchi', 'Hansen', 'Martin', 'Weber', 'Novak', 'Bauer', 'Laurent', 'Brown', 'Kowalski', 'Costa',
+              'Berg', 'Wagner', 'Meyer', 'Lopez', 'Virtanen', 'Andersen', 'Romano', 'Taylor']
+INVESTOR_WORDS = ['North', 'Atlantic', 'Alpine', 'Summit', 'Harbor', 'Granite', 'Beacon', 'Cedar', 'Horizon', 'Meridian',
+                  'Orbit', 'Pioneer', 'Redwood', 'Sapphire', 'Sterling', 'Tidal', 'Vantage', 'Aurora', 'Crescent', 'Evergreen',
+                  'Falcon', 'Keystone', 'Lighthouse', 'Maple', 'Oak', 'Polar', 'Quantum', 'River', 'Signal', 'Union']
+INVESTOR_SECOND_WORDS = ['Bridge', 'Point', 'Gate', 'Rock', 'Field', 'Peak', 'Stone', 'Line', 'Crest', 'Wood', 'Light',
+                         'Star', 'Bay', 'Hill', 'Lake', 'Park', 'Ridge', 'Shore', 'Vale', 'Way']
+INVESTOR_SUFFIXES = ['Ventures', 'Capital', 'Partners', 'Investments', 'Fund', 'VC', 'Growth', 'Equity', 'Holdings', 'Angels']
+INVESTOR_REGIONS = (0.6, 0.4) #Share of EU and US investors
+
+def _choice(rng, options: dict, size: int) -> np.ndarray:
+    #Draws keys of options with their probabilities (first element of a tuple value), normalized so they sum to 1
+    keys = list(options)
+    weights = np.array([value[0] if isinstance(value, tuple) else value for value in options.values()], dtype=float)
+    return np.asarray(keys, dtype=object)[rng.choice(len(keys), size=size, p=weights / weights.sum())]
+
+def _join(columns: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    #Joins the valid entries of every row with ', ' like Crunchbase list columns, rows without entries become None
+    joined = np.where(valid[:, 0], columns[:, 0], '').astype(object)
+    for position in range(1, columns.shape[1]):
+        separator = np.where(valid[:, position] & (joined != ''), ', ', '').astype(object)
+        joined = joined + separator + np.where(valid[:, position], columns[:, position], '').astype(object)
+    joined[joined == ''] = None
+    return joined
+
+def _unique_per_row(draws: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    #Valid mask of the first counts[row] draws of every row, a value drawn twice in a row is only kept once
+    valid = np.arange(draws.shape[1]) < counts[:, None]
+    for position in range(1, draws.shape[1]):
+        valid[:, position] &= ~(draws[:, :position] == draws[:, position:position + 1]).any(axis=1)
+    return valid
+
+def _person_names(rng, size: int) -> np.ndarray:
+    first = np.asarray(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=size)]
+    last = np.asarray(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=size)]
+    return first + ' ' + last
+
+def generate_investors(count: int = DEFAULT_INVESTORS, seed: int = 42) -> pd.DataFrame:
+    #Investors in the layout of the investor files plus a Region column, most active first
+    rng = np.random.default_rng([seed, 1])
+    combinations = len(INVESTOR_WORDS) * len(INVESTOR_SECOND_WORDS) * len(INVESTOR_SUFFIXES)
+    codes = rng.permutation(max(count, combinations))[:count]
+    words, rest = np.divmod(codes % combinations, len(INVESTOR_SECOND_WORDS) * len(INVESTOR_SUFFIXES))
+    second_words, suffixes = np.divmod(rest, len(INVESTOR_SUFFIXES))
+    names = (np.asarray(INVESTOR_WORDS, dtype=object)[words] + np.asarray(INVESTOR_SECOND_WORDS, dtype=object)[second_words]
+             + ' ' + np.asarray(INVESTOR_SUFFIXES, dtype=object)[suffixes])
+    #Names only repeat when more investors than word combinations are asked for, a number keeps them unique
+    repeats = codes // combinations
+    names = np.where(repeats > 0, names + ' ' + (repeats + 1).astype(str).astype(object), names)
+
+    #Heavy tailed activity: a few investors (accelerators, public funds) account for a large share of all investments
+    investments = np.maximum(np.round(rng.lognormal(3.5, 1.2, count)), 1).astype(np.int64)
+    exits = np.round(investments * rng.beta(1.2, 12, count)).astype(float)
+    exits[rng.random(count) < 0.1] = np.nan
+
+    investors = pd.DataFrame({
+        'Organization/Person Name': names,
+        'Number of Investments': investments,
+        'Number of Exits': exits,
+        'Region': _choice(rng, dict(zip(['EU', 'US'], INVESTOR_REGIONS)), count)
+    })
+    return investors.sort_values('Number of Investments', ascending=False, kind='stable', ignore_index=True)
+
+def write_investors(directory: str, count: int = DEFAULT_INVESTORS, seed: int = 42) -> tuple:
+    #Writes EU_Investors.csv and US_Investors.csv like the bundled investor files, returns both paths
+    os.makedirs(directory, exist_ok=True)
+    investors = generate_investors(count, seed)
+    paths = []
+    for region in ['EU', 'US']:
+        path = os.path.join(directory, f'{region}_Investors.csv')
+        region_investors = investors[investors['Region'] == region].drop(columns='Region')
+        region_investors.to_csv(path, index=False, float_format='%.0f')
+        paths.append(path)
+    return tuple(paths)
+
+def _dates(rng, round_profile: dict, size: int) -> tuple:
+    #Last funding in the year before the export, founded a few years earlier with Crunchbase's date precisions
+    last_funding = REFERENCE_DATE - pd.to_timedelta(rng.integers(0, 365, size), unit='D')
+    age_days = np.minimum(rng.gamma(2.0, round_profile['age'] / 2, size) * 365.25, 40 * 365.25).astype(np.int64) + 30
+    founded = pd.DatetimeIndex(last_funding - pd.to_timedelta(age_days, unit='D'))
+
+    precision = _choice(rng, {'year': 0.64, 'day': 0.24, 'month': 0.12}, size)
+    year_start = founded.to_period('Y').to_timestamp()
+    month_start = founded.to_period('M').to_timestamp()
+    founded = np.where(precision == 'year', year_start, np.where(precision == 'month', month_start, founded))
+    return pd.DatetimeIndex(founded).strftime('%Y-%m-%d'), pd.DatetimeIndex(last_funding).strftime('%Y-%m-%d'), precision
+
+def _amounts(rng, round_profile: dict, size: int) -> dict:
+    #Last and total funding in a local currency (rounded like announced amounts) and in USD
+    currencies = _choice(rng, CURRENCIES, size)
+    usd_rates = np.array([CURRENCIES[currency][1] for currency in currencies])
+    usd_amount = rng.lognormal(*round_profile['log_amount'], size)
+    last_amount = np.maximum(np.round(usd_amount / usd_rates, -5), 100_000)
+
+    earlier_rounds = rng.poisson(round_profile['earlier_rounds'], size)
+    earlier_amount = np.where(earlier_rounds > 0, last_amount * rng.lognormal(-0.9, 0.8, size) * np.sqrt(earlier_rounds), 0)
+    total_amount = last_amount + np.round(earlier_amount, -4)
+    return {
+        'currency': currencies,
+        'last': last_amount.astype(np.int64),
+        'last_usd': np.round(last_amount * usd_rates).astype(np.int64),
+        'total': total_amount.astype(np.int64),
+        'total_usd': np.round(total_amount * usd_rates).astype(np.int64),
+        'rounds': earlier_rounds + 1
+    }
+
+def generate_companies(rows: int, funding_round: str = 'Series A', seed: int = 42, investors: pd.DataFrame = None,
+                       first_row: int = 0) -> pd.DataFrame:
+    #rows companies in the column order of schema.COLUMNS, first_row numbers the companies of later chunks of the same file
+    if funding_round not in ROUND_PROFILES:
+        raise ValueError(f"No synthetic profile for the funding round '{funding_round}', available: {list(ROUND_PROFILES)}")
+    round_profile = ROUND_PROFILES[funding_round]
+    if investors is None:
+        investors = generate_investors(seed=seed)
+    rng = np.random.default_rng([seed, 2, first_row])
+
+    #Names are not unique (like real company names), the URL carries the company number so it is
+    row_ids = np.arange(first_row, first_row + rows)
+    names = (np.asarray(NAME_PARTS, dtype=object)[rng.integers(len(NAME_PARTS), size=rows)]
+             + np.asarray(NAME_ENDINGS, dtype=object)[rng.integers(len(NAME_ENDINGS), size=rows)])
+    slugs = np.char.lower(names.astype(str)).astype(object) + '-' + row_ids.astype(str).astype(object)
+
+    #Industry groups without repeats: Gumbel top-k over the Zipf weights draws k distinct groups per company
+    industry_weights = 1 / np.arange(1, len(INDUSTRY_GROUPS) + 1) ** 0.9
+    keys = np.log(industry_weights) + rng.gumbel(size=(rows, len(INDUSTRY_GROUPS)))
+    industry_draws = np.argsort(-keys, axis=1)[:, :max(INDUSTRY_COUNTS)]
+    industry_counts = _choice(rng, INDUSTRY_COUNTS, rows).astype(np.int64)
+    industry_valid = np.arange(industry_draws.shape[1]) < industry_counts[:, None]
+    industry_groups = _join(np.asarray(INDUSTRY_GROUPS, dtype=object)[industry_draws], industry_valid)
+    main_industry = np.asarray(INDUSTRY_GROUPS, dtype=object)[industry_draws[:, 0]]
+
+    #Active investors appear more often, a few top investors are individuals missing from the investor files
+    investor_names = investors['Organization/Person Name'].to_numpy(dtype=object)
+    activity = investors['Number of Investments'].to_numpy(dtype=float)
+    investor_draws = rng.choice(len(investor_names), size=(rows, max(INVESTOR_COUNTS)), p=activity / activity.sum())
+    listed_names = investor_names[investor_draws]
+    unlisted = rng.random(listed_names.shape) < UNLISTED_INVESTOR_SHARE
+    listed_names[unlisted] = _person_names(rng, int(unlisted.sum()))
+    investor_counts = _choice(rng, INVESTOR_COUNTS, rows).astype(np.int64)
+    investor_valid = _unique_per_row(listed_names, investor_counts)
+    top_investors = _join(listed_names, investor_valid)
+    number_of_investors = investor_valid.sum(axis=1) + np.where(investor_counts == 5, rng.poisson(3, rows), 0)
+
+    founder_names = _person_names(rng, rows * 3).reshape(rows, 3)
+    founder_valid = _unique_per_row(founder_names, rng.integers(1, 4, rows)) & (rng.random(rows) >= 0.22)[:, None]
+    founders = _join(founder_names, founder_valid)
+
+    founded, last_funding, precision = _dates(rng, round_profile, rows)
+    amounts = _amounts(rng, round_profile, rows)
+    cities = _choice(rng, CITIES, rows)
+    city_names = np.array([city.split(',')[0] for city in cities], dtype=object)
+    postal_codes = np.array([CITIES[city][1] for city in cities], dtype=object) + rng.integers(10, 99, rows).astype(str).astype(object)
+    postal_codes[rng.random(rows) < 0.33] = None
+    ranks = rng.integers(1_000, 400_000, rows)
+    has_email = rng.random(rows) >= 0.24
+    has_linkedin = rng.random(rows) >= 0.02
+    descriptions = names + ' builds ' + np.char.lower(main_industry.astype(str)).astype(object) + ' products'
+    statuses = np.where(rng.random(rows) < 0.01, 'M&A', round_profile['status']).astype(object)
+
+    df = pd.DataFrame({
+        'Organization Name': names,
+        'Organization Name URL': 'https://www.crunchbase.com/organization/' + slugs,
+        'Growth Category': np.where(rng.random(rows) < 0.5, 'Growing', None),
+        'Postal Code': postal_codes,
+        'Full Description': descriptions + ' for customers across Europe. The company was founded in ' + city_names + '.',
+        'Actively Hiring': None,
+        'Industries': industry_groups,
+        'Headquarters Location': cities,
+        'Description': descriptions,
+        'CB Rank (Company)': pd.Series(ranks).map('{:,}'.format).to_numpy(dtype=object),
+        'Founded Date': founded,
+        'Founded Date Precision': precision,
+        'Number of Investments': np.nan,
+        'Founders': founders,
+        'IPO Status': 'Private',
+        'CB Rank (Organization)': pd.Series(ranks + rng.integers(0, 2_000, rows)).map('{:,}'.format).to_numpy(dtype=object),
+        'CB Rank (School)': np.nan,
+        'Last Funding Date': last_funding,
+        'Number of Funding Rounds': amounts['rounds'],
+        'Funding Status': statuses,
+        'Last Funding Amount': amounts['last'],
+        'Last Funding Amount Currency': amounts['currency'],
+        'Last Funding Amount (in USD)': amounts['last_usd'],
+        'Last Funding Type': funding_round,
+        'Total Funding Amount': amounts['total'],
+        'Total Funding Amount Currency': amounts['currency'],
+        'Total Funding Amount (in USD)': amounts['total_usd'],
+        'Last Equity Funding Amount': amounts['last'],
+        'Last Equity Funding Amount Currency': amounts['currency'],
+        'Last Equity Funding Amount (in USD)': amounts['last_usd'],
+        'Last Equity Funding Type': funding_round,
+        'Total Equity Funding Amount': amounts['total'],
+        'Total Equity Funding Amount Currency': amounts['currency'],
+        'Total Equity Funding Amount (in USD)': amounts['total_usd'],
+        'Top 5 Investors': top_investors,
+        'Number of Investors': number_of_investors,
+        'Industry Groups': industry_groups,
+        'Investment Stage': None,
+        'Headquarters Regions': np.array([CITIES[city][2] for city in cities], dtype=object),
+        'Website': 'https://www.' + slugs + '.com',
+        'LinkedIn': np.where(has_linkedin, 'https://www.linkedin.com/company/' + slugs, None),
+        'Contact Email': np.where(has_email, 'info@' + slugs + '.com', None),
+        'Number of Employees': _choice(rng, round_profile['employees'], rows)
+    })
+    return df[list(schema.COLUMNS)]
+
+def write_companies(path: str, rows: int, funding_round: str = 'Series A', seed: int = 42,
+                    investors: pd.DataFrame = None, chunk_rows: int = CHUNK_ROWS) -> str:
+    #Streams the file chunk by chunk into a temporary file and moves it into place when it is complete
+    if investors is None:
+        investors = generate_investors(seed=seed)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8', newline='') as file:
+        for first_row in range(0, rows, chunk_rows):
+            chunk = generate_companies(min(chunk_rows, rows - first_row), funding_round, seed, investors, first_row)
+            chunk.to_csv(file, index=False, header=first_row == 0)
+    os.replace(temporary_path, path)
+    return path
+
+def write_dataset(directory: str, rows: int, funding_round: str = 'Series A', seed: int = 42,
+                  investor_count: int = DEFAULT_INVESTORS, chunk_rows: int = CHUNK_ROWS) -> dict:
+    #A company file and the two investor files that its top investors come from
+    investors = generate_investors(investor_count, seed)
+    eu_path, us_path = write_investors(directory, investor_count, seed)
+    file_name = f"{funding_round.replace(' ', '')}_synthetic_{rows}_companies.csv"
+    companies_path = write_companies(os.path.join(directory, file_name), rows, funding_round, seed, investors, chunk_rows)
+    return {'companies': companies_path, 'eu_investors': eu_path, 'us_investors': us_path}
+
+def parse_arguments(arguments=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic Crunchbase company export and investor files')
+    parser.add_argument('directory', help='Directory the files are written to')
+    parser.add_argument('--rows', type=int, default=100_000, help='Number of companies (default: %(default)s)')
+    parser.add_argument('--round', dest='funding_round', default='Series A', choices=list(ROUND_PROFILES),
+                        help='Last Funding Type of every company (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed, the same seed gives the same files (default: %(default)s)')
+    parser.add_argument('--investors', type=int, default=DEFAULT_INVESTORS, help='Number of investors (default: %(default)s)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='Rows generated at once (default: %(default)s)')
+    return parser.parse_args(arguments)
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    paths = write_dataset(arguments.directory, arguments.rows, arguments.funding_round, arguments.seed,
+                          arguments.investors, arguments.chunk_rows)
+    for path in paths.values():
+        print(path)
@@ -1,29 +1,77 @@
 #This files purpose is to clean the data and return a relevant dataframe for the application
 
+import hashlib
+import os
+import shutil
 import pandas as pd
 
+COLUMNS_TO_KEEP = [
+    "Organization Name",
+    "Organization Name URL",
+    "Full Description",
+    "Founded Date",
+    "Last Funding Date",
+    "Number of Funding Rounds",
+    "Founders",
+    "Last Funding Type",
+    "Top 5 Investors",
+    "Industry Groups",
+    "Total Funding Amount (in USD)",
+    "Last Funding Amount (in USD)",
+    "Number of Employees"
+    ]
+
+#Comma separated columns that are split into lists, and date columns that are parsed once here
+LIST_COLUMNS = ["Founders", "Top 5 Investors", "Industry Groups"]
+DATE_COLUMNS = ["Founded Date", "Last Funding Date"]
+
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    
-    columns_to_keep = [
-        "Organization Name",
-        "Organization Name URL",
-        "Full Description",
-        "Founded Date",
-        "Last Funding Date",
-        "Number of Funding Rounds",
-        "Founders",
-        "Last Funding Type",
-        "Top 5 Investors",
-        "Industry Groups",
-        "Total Funding Amount (in USD)",
-        "Last Funding Amount (in USD)",
-        "Number of Employees"
-        ]
-    df = df[columns_to_keep]
+    df = df[COLUMNS_TO_KEEP].copy()
 
     #Using the df.loc method to apply a lambda function to the specified columns
     df.loc[:,"Founders"] = df["Founders"].apply(lambda x: x.split(', ') if isinstance(x, str) else None)
     df.loc[:,"Top 5 Investors"] = df["Top 5 Investors"].apply(lambda x: x.split(', ') if isinstance(x, str) else None)
     df.loc[:,"Industry Groups"] = df["Industry Groups"].apply(lambda x: x.split(', ') if isinstance(x, str) else None)
 
-    return df
\ No newline at end of file
+    for column in DATE_COLUMNS:
+        df[column] = pd.to_datetime(df[column])
+
+    return df
+
+def file_fingerprint(file_path: str) -> str:
+    #Content hash of the input file, read in blocks so large exports are never fully loaded into memory
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def source_id(file_path: str) -> str:
+    #Short stable id of an input file location, used to find cache entries built from older versions of the file
+    return hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()[:12]
+
+def evict_stale_entries(cache_dir: str, file_path: str, keep: str, max_entries: int):
+    #Entries of the same source file with another key were built from an older version of the file or other settings
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if not name.endswith('.tmp')]
+    prefix = source_id(file_path) + '-'
+    stale = [path for path in entries if os.path.basename(path).startswith(prefix) and path != keep]
+
+    #Keep the cache bounded by dropping the least recently used entries
+    #Another thread (e.g. MultiMarket loading several files) may evict the same entries at the same time,
+    #so entries that disappear in the meantime are skipped
+    remaining = []
+    for path in entries:
+        if path not in stale and path != keep:
+            try:
+                remaining.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue
+    remaining = [path for _, path in sorted(remaining, reverse=True)]
+    for entry_path in stale + remaining[max_entries - 1:]:
+        try:
+            if os.path.isdir(entry_path):
+                shutil.rmtree(entry_path, ignore_errors=True)
+            else:
+                os.remove(entry_path)
+        except FileNotFoundError:
+            continue
@@ -33,7 +33,10 @@ def visualize_industry_group_statistics(market_obj: market.Market, *industry_gro
     
     plt.show()
 
-def visualize_top_20_investors(investor_data=investor.investor_data_frame()):
+def visualize_top_20_investors(investor_data=None):
+    if investor_data is None:
+        investor_data = investor.get_registry().to_frame()
+
     # Filter top 20 investors from each region
     top_20_us = investor_data[investor_data['Region'] == 'US'].nlargest(20, 'Score')
     top_20_eu = investor_data[investor_data['Region'] == 'EU'].nlargest(20, 'Score')